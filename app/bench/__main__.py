@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.bench import percentiles, write_results
+from app.bench.corpus import DEFAULT_LLM_SHARE, generate_jobs, query_mix, render_detail_html
+from app.bench.fakes import HashEmbedder, StubLLM
+
+
+# python -m app.bench: parse, ingest, retrieve and generate over synthetic
+# corpora, with a hashing embedder and a stub LLM so runs are deterministic
+# and offline. Results are JSON tagged with the git commit; pass --baseline
+# with an earlier file to print the deltas.
+
+# index_build is the in-memory path the suite serves from (chunk, hash-embed,
+# NumpyStore); chroma_ingest times the real ingest write (upsert_documents into
+# a persistent Chroma collection with its own embedder) on a capped sample
+STAGES = ["parse", "index_build", "chroma_ingest", "retrieve", "generate"]
+
+
+def timed_ms(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - t0) * 1000
+
+
+def bench_parse(n_pages: int, page_kb: float) -> Dict:
+    from app.scraper.parse import parse_job_detail
+    jobs = list(generate_jobs(n_pages, seed=1))
+    pages = [render_detail_html(j, page_kb) for j in jobs]
+    samples = [timed_ms(parse_job_detail, html, j["sourceUrl"], j["category"]) for html, j in zip(pages, jobs)]
+    return {
+        "pages": n_pages,
+        "avg_page_kb": round(sum(len(p) for p in pages) / n_pages / 1024, 1),
+        "pages_per_s": round(n_pages / (sum(samples) / 1000), 1),
+        "page_ms": percentiles(samples),
+    }
+
+
+def bench_chroma_ingest(docs: List[Dict], batch: int) -> Dict:
+    from app.ingest.vectorstore import get_client, upsert_documents
+    with tempfile.TemporaryDirectory(prefix="jobyaari-bench-") as tmp:
+        client = get_client(tmp)
+        t0 = time.perf_counter()
+        for i in range(0, len(docs), batch):
+            upsert_documents(client, "bench_ingest", docs[i:i + batch])
+        elapsed = time.perf_counter() - t0
+    return {"documents": len(docs), "s": round(elapsed, 3), "docs_per_s": round(len(docs) / elapsed, 1)}
+
+
+def bench_size(
+    n: int, n_queries: int, stages: List[str], llm_latency_ms: float, dim: int, chroma_docs: int, llm_share: float
+) -> Dict:
+    from app.chat.rag import RAGService
+    from app.chat.stores import NumpyStore
+    from app.ingest.chunk import job_to_document
+
+    row: Dict = {"documents": n}
+    t0 = time.perf_counter()
+    jobs = list(generate_jobs(n))
+    row["generate_s"] = round(time.perf_counter() - t0, 3)
+
+    embedder = HashEmbedder(dim)
+    t0 = time.perf_counter()
+    docs = [job_to_document(j) for j in jobs]
+    chunk_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    vectors = np.concatenate([embedder([d["text"] for d in docs[i:i + 4096]]) for i in range(0, n, 4096)])
+    embed_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    store = NumpyStore(
+        vectors,
+        [d["id"] for d in docs],
+        [d["metadata"] for d in docs],
+        [d["text"] for d in docs],
+        embed_fn=embedder,
+        normalized=True,
+    )
+    build_s = time.perf_counter() - t0
+    if "index_build" in stages:
+        total = chunk_s + embed_s + build_s
+        row["index_build"] = {
+            "chunk_s": round(chunk_s, 3),
+            "embed_s": round(embed_s, 3),
+            "index_build_s": round(build_s, 3),
+            "docs_per_s": round(n / total, 1),
+        }
+    if "chroma_ingest" in stages:
+        try:
+            row["chroma_ingest"] = bench_chroma_ingest(docs[:chroma_docs], batch=1000)
+        except Exception as e:
+            # e.g. the collection's embedding model cannot be downloaded offline
+            row["chroma_ingest"] = {"error": f"{type(e).__name__}: {e}"}
+
+    if "retrieve" not in stages and "generate" not in stages:
+        return row
+
+    llm = StubLLM(llm_latency_ms)
+    rag = RAGService(store=store, llm=llm)
+    rag._cache_size = 0  # measure the uncached path
+    queries = query_mix(n_queries, llm_share=llm_share)
+    rag.retrieve(queries[0])  # warm up
+    retrieve_ms, generate_ms, retrieved = [], [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        res = rag.retrieve(q)
+        retrieve_ms.append((time.perf_counter() - t0) * 1000)
+        retrieved.append(res)
+    if "retrieve" in stages:
+        row["retrieve_ms"] = percentiles(retrieve_ms)
+    if "generate" in stages:
+        for q, res in zip(queries, retrieved):
+            generate_ms.append(timed_ms(rag.generate, q, res))
+        row["generate_ms"] = percentiles(generate_ms)
+        row["llm_calls"] = llm.calls
+    return row
+
+
+def compare(baseline_path: str, results: Dict) -> None:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    print(f"[bench] vs {baseline_path} (commit {base.get('commit')})")
+    for key, row in results.get("sizes", {}).items():
+        old = base["results"].get("sizes", {}).get(key)
+        if not old:
+            continue
+        for metric in ("retrieve_ms", "generate_ms"):
+            if metric in row and metric in old:
+                for p in ("p50", "p95", "p99"):
+                    a, b = old[metric][p], row[metric][p]
+                    delta = (b - a) / a * 100 if a else 0.0
+                    print(f"  n={key:<8} {metric}.{p}: {a:>8.3f} -> {b:>8.3f} ms ({delta:+.1f}%)")
+        for metric in ("index_build", "chroma_ingest"):
+            if "docs_per_s" in row.get(metric, {}) and "docs_per_s" in old.get(metric, {}):
+                a, b = old[metric]["docs_per_s"], row[metric]["docs_per_s"]
+                print(f"  n={key:<8} {metric} docs/s: {a:>10.1f} -> {b:>10.1f} ({(b - a) / a * 100 if a else 0:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.bench", description="JobYaari benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--parse-pages", type=int, default=500)
+    parser.add_argument("--page-kb", type=float, default=0, help="Pad rendered detail pages to about this size")
+    parser.add_argument("--chroma-docs", type=int, default=2000, help="Documents per size for the chroma_ingest stage")
+    parser.add_argument("--llm-share", type=float, default=DEFAULT_LLM_SHARE, help="Share of LLM-path queries in the mix")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Fixed latency of the stub LLM")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--out", type=str, default="bench_results/suite.json")
+    parser.add_argument("--baseline", type=str, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    results: Dict = {
+        "env": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "cpus": os.cpu_count(),
+            "machine": platform.machine(),
+        },
+        "params": vars(args),
+        "sizes": {},
+    }
+    if "parse" in args.stages:
+        results["parse"] = bench_parse(args.parse_pages, args.page_kb)
+        p = results["parse"]
+        print(f"[bench] parse: {p['pages_per_s']} pages/s, p50 {p['page_ms']['p50']} ms ({p['avg_page_kb']} KB/page)")
+
+    for n in args.sizes:
+        row = bench_size(n, args.queries, args.stages, args.llm_latency_ms, args.dim, args.chroma_docs, args.llm_share)
+        results["sizes"][str(n)] = row
+        parts = [f"n={n}"]
+        if "index_build" in row:
+            parts.append(f"index build {row['index_build']['docs_per_s']} docs/s")
+        if "chroma_ingest" in row:
+            c = row["chroma_ingest"]
+            parts.append(f"chroma ingest {c['docs_per_s']} docs/s" if "error" not in c else f"chroma ingest failed ({c['error']})")
+        if "retrieve_ms" in row:
+            parts.append("retrieve p50/p95/p99 {p50}/{p95}/{p99} ms".format(**row["retrieve_ms"]))
+        if "generate_ms" in row:
+            parts.append("generate p50/p95/p99 {p50}/{p95}/{p99} ms".format(**row["generate_ms"]))
+        print("[bench] " + " | ".join(parts))
+
+    write_results(args.out, "suite", results)
+    if args.baseline:
+        compare(args.baseline, results)
+
+
+if __name__ == "__main__":
+    main()
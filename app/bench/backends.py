@@ -0,0 +1,99 @@
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.bench import percentiles, write_results
+from app.chat.stores import ChromaStore, NumpyStore
+
+CATEGORIES = ["engineering", "science", "commerce", "education"]
+
+
+def synthetic_vectors(n: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vecs = rng.standard_normal((n, dim), dtype=np.float32)
+    ids = [f"job-{i}" for i in range(n)]
+    metas = [
+        {"category": CATEGORIES[i % 4], "numVacancies": int(v)}
+        for i, v in enumerate(rng.integers(1, 500, size=n))
+    ]
+    docs = [f"Title: Synthetic post {i}" for i in range(n)]
+    return vecs, ids, metas, docs
+
+
+def build_numpy(vecs, ids, metas, docs) -> NumpyStore:
+    return NumpyStore(vecs, ids, metas, docs)
+
+
+def build_chroma(vecs, ids, metas, docs) -> ChromaStore:
+    import chromadb
+    client = chromadb.EphemeralClient()
+    name = f"bench-{len(ids)}-{time.time_ns()}"
+    coll = client.create_collection(name, metadata={"hnsw:space": "cosine"})
+    batch = client.get_max_batch_size()
+    for i in range(0, len(ids), batch):
+        coll.add(ids=ids[i:i + batch], embeddings=vecs[i:i + batch], metadatas=metas[i:i + batch], documents=docs[i:i + batch])
+    return ChromaStore(coll)
+
+
+def time_queries(store, queries: np.ndarray, k: int, where=None) -> List[float]:
+    samples = []
+    for q in queries:
+        t0 = time.perf_counter()
+        store.query(query_embeddings=q[None, :], n_results=k, where=where)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def run(sizes: List[int], dim: int, n_queries: int, batch: int, k: int, backends: List[str]) -> Dict:
+    builders = {"numpy": build_numpy, "chroma": build_chroma}
+    rng = np.random.default_rng(1)
+    queries = rng.standard_normal((n_queries, dim), dtype=np.float32)
+    results = {}
+    for n in sizes:
+        vecs, ids, metas, docs = synthetic_vectors(n, dim)
+        for name in backends:
+            t0 = time.perf_counter()
+            store = builders[name](vecs, ids, metas, docs)
+            build_s = time.perf_counter() - t0
+
+            store.query(query_embeddings=queries[:1], n_results=k)  # warm up
+            single = time_queries(store, queries, k)
+            filtered = time_queries(store, queries, k, where={"$and": [{"category": "science"}, {"numVacancies": {"$gte": 100}}]})
+            t0 = time.perf_counter()
+            for i in range(0, n_queries, batch):
+                store.query(query_embeddings=queries[i:i + batch], n_results=k)
+            batched_qps = n_queries / (time.perf_counter() - t0)
+
+            row = {
+                "build_s": round(build_s, 3),
+                "single_ms": percentiles(single),
+                "filtered_ms": percentiles(filtered),
+                "batched_qps": round(batched_qps, 1),
+            }
+            results[f"{name}/{n}"] = row
+            print(
+                f"[bench] {name:<6} n={n:<8} build={row['build_s']:>7.3f}s "
+                f"p50={row['single_ms']['p50']:>8.3f}ms filtered_p50={row['filtered_ms']['p50']:>8.3f}ms "
+                f"batch{batch}={row['batched_qps']:>9.1f} q/s"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Chroma and NumPy retrieval backends on synthetic vectors")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--backends", nargs="+", default=["numpy", "chroma"])
+    parser.add_argument("--out", type=str, default="bench_results/backends.json")
+    args = parser.parse_args()
+    results = run(args.sizes, args.dim, args.queries, args.batch, args.top_k, args.backends)
+    write_results(args.out, "backends", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import json
+import random
+from html import escape
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from app.models.schema import JobRecord
+
+
+# Synthetic JobYaari postings with the same fields, value formats and
+# category skew as data/processed/jobs.jsonl, for scaling runs past 45 rows.
+
+ORGS = {
+    "engineering": ["UPSC", "DRDO", "ISRO", "BHEL", "NTPC", "Indian Railways", "GAIL", "Coal India Limited", "BEL", "HAL"],
+    "science": ["CSIR-NCL", "IISER Pune", "ICMR", "IIT Bombay", "AIIMS Delhi", "Intelligence Bureau", "NIO Goa", "BARC"],
+    "commerce": ["SBI", "IBPS", "RBI", "LIC", "NABARD", "SEBI", "Indian Bank", "Income Tax Department"],
+    "education": ["KVS", "NVS", "Delhi Subordinate Services Selection Board", "DSSSB", "UP Basic Education Board", "CBSE"],
+}
+POSTS = {
+    "engineering": ["Junior Engineer (Civil)", "Assistant Engineer (Electrical)", "Scientist-B", "Graduate Engineer Trainee", "Technician Apprentice", "Engineering Services Examination"],
+    "science": ["Research Associate-II (RA-II)", "Project Scientist-I", "Junior Research Fellow", "Senior Research Fellow", "Lab Technician", "Junior Intelligence Officer-II/Tech"],
+    "commerce": ["Probationary Officer", "Clerk", "Assistant Manager (Finance)", "Accounts Officer", "Tax Assistant", "Specialist Officer"],
+    "education": ["Assistant Teacher (Primary)", "TGT (Mathematics)", "PGT (Physics)", "Librarian", "Lecturer", "Principal"],
+}
+QUALS = {
+    "engineering": ["B.E/B.Tech", "Diploma in Engineering", "M.E/M.Tech", "B.E/B.Tech,M.E/M.Tech"],
+    "science": ["M.Sc", "Ph.D", "B.Sc", "M.Sc,Ph.D", "B.E/B.Tech,MCA"],
+    "commerce": ["Any Graduate", "B.Com", "M.Com", "CA", "MBA/PGDM"],
+    "education": ["B.Ed", "M.A,B.Ed", "Bachelor Of Elementary Education [B.El.Ed],Diploma in Education [D.Ed]", "Post Graduate"],
+}
+EXPERIENCE = ["Fresher", "1 Year", "2 Years", "3 Years", "5 Years", "Fresher/Experienced"]
+LOCATIONS = ["all india", "new delhi", "mumbai", "pune", "bangalore", "hyderabad", "kolkata", "chennai", "lucknow"]
+SALARIES = ["Level 10, as per 7th CPC", "Rs. 25,500 - 81,100/-", "Rs. 35,400 - 1,12,400/-", "Rs. 56,000 per month", "As per norms"]
+AGES = ["18 - 27", "21 - 30", "21 - 32", "Max 35", "Max 40"]
+CATEGORY_WEIGHTS = {"engineering": 0.35, "science": 0.25, "commerce": 0.2, "education": 0.2}
+
+
+def generate_jobs(n: int, seed: int = 0) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    cats = list(CATEGORY_WEIGHTS)
+    weights = list(CATEGORY_WEIGHTS.values())
+    for i in range(n):
+        cat = rng.choices(cats, weights)[0]
+        record = JobRecord(
+            category=cat,
+            postTitle=rng.choice(POSTS[cat]),
+            organizationName=rng.choice(ORGS[cat]),
+            numVacancies=rng.choice([None, 1, 2, 5, 10, 25, 50, 100, 250, 474, 1000]) if rng.random() < 0.95 else None,
+            salary=rng.choice(SALARIES),
+            ageRequirement=rng.choice(AGES),
+            experienceRequired=rng.choice(EXPERIENCE),
+            qualification=rng.choice(QUALS[cat]),
+            location=rng.choice(LOCATIONS),
+            lastDate=f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-2025",
+            sourceUrl=f"https://www.jobyaari.com/jobdetails/{100000 + i}",
+        )
+        yield record.model_dump()
+
+
+def render_detail_html(job: Dict, page_kb: float = 0) -> str:
+    # Mirrors the detail-page DOM that app.scraper.parse.parse_job_detail reads.
+    # Parse cost grows with page size; page_kb pads with filler paragraphs up to
+    # roughly that many KB so runs can match pages saved from the live site.
+    def info(label: str, value) -> str:
+        return f'<div class="job-post-info-text"><h5 class="label-head">{label}</h5><p>{escape(str(value or ""))}</p></div>'
+
+    para = "<p>Important instructions for candidates, paragraph {}.</p>"
+    n_paras = max(40, int(page_kb * 1024 / len(para.format(100))))
+    filler = "".join(para.format(i) for i in range(n_paras))
+    return (
+        "<html><head><title>JobYaari</title></head><body><div class='container'>"
+        f"<div class='drop__profession'>{escape(job['organizationName'])}</div>"
+        f"<h5 class='post-name'>{escape(job['postTitle'])}</h5>"
+        f"<div class='details'><div class='text'>Job Openings</div><div>{job.get('numVacancies') or ''}</div></div>"
+        + info("Salary", job.get("salary"))
+        + info("Experience", job.get("experienceRequired"))
+        + info("Qualification", job.get("qualification"))
+        + info("Last Date", job.get("lastDate"))
+        + info("Age Limit", job.get("ageRequirement"))
+        + f"<div class='cta-location'>{escape(job.get('location') or '')}</div>"
+        + filler
+        + "</div></body></html>"
+    )
+
+
+# README examples plus templated variants over the corpus' own titles, split
+# by the answer path RAGService takes: field templates name a metadata field
+# (app.chat.rag.detect_field) and are usually answered without the LLM; the
+# rest go to the LLM. query_mix draws from them at an explicit llm_share.
+README_QUERIES = [
+    "What are the latest notifications in Engineering?",
+    "Show me a Science job which has 1 year of experience.",
+    "Tell me Education qualification for Research Associate-II (RA-II) post.",
+]
+FIELD_TEMPLATES = [
+    "Show me a {Category} job which has {years} year of experience.",
+    "Tell me {Category} qualification for {title} post.",
+    "{category} jobs with more than {n} vacancies",
+    "What is the salary for {title} post?",
+    "Last date for {title} post",
+    "Any {category} openings in {location}?",
+]
+LLM_TEMPLATES = [
+    "What are the latest notifications in {Category}?",
+    "Any {category} jobs in {location}?",
+    "Which {Category} posts are open at {org}?",
+    "Tell me about the {title} post at {org}.",
+    "Show me recent {category} recruitments for freshers.",
+    "Are there {category} jobs for {qual} candidates?",
+]
+DEFAULT_LLM_SHARE = 0.7
+
+
+def query_mix(n: int, seed: int = 0, llm_share: float = DEFAULT_LLM_SHARE) -> List[str]:
+    # Every tenth query is a README example of the drawn kind
+    from app.chat.rag import detect_field
+    readme = {
+        "llm": [q for q in README_QUERIES if detect_field(q) is None],
+        "field": [q for q in README_QUERIES if detect_field(q) is not None],
+    }
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        kind = "llm" if rng.random() < llm_share else "field"
+        if i % 10 == 0 and readme[kind]:
+            out.append(rng.choice(readme[kind]))
+            continue
+        cat = rng.choice(list(CATEGORY_WEIGHTS))
+        templates = LLM_TEMPLATES if kind == "llm" else FIELD_TEMPLATES
+        out.append(rng.choice(templates).format(
+            Category=cat.title(),
+            category=cat,
+            title=rng.choice(POSTS[cat]),
+            org=rng.choice(ORGS[cat]),
+            qual=rng.choice(QUALS[cat]),
+            years=rng.choice([1, 2, 3]),
+            n=rng.choice([5, 10, 50, 100]),
+            location=rng.choice(LOCATIONS),
+        ))
+    return out
+
+
+def llm_share_of(queries: List[str]) -> float:
+    # Share of queries detect_field leaves to the LLM path
+    from app.chat.rag import detect_field
+    return sum(detect_field(q) is None for q in queries) / len(queries) if queries else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic jobs.jsonl")
+    parser.add_argument("--n", type=int, required=True)
+    parser.add_argument("--out", type=str, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    path = Path(args.out)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for job in generate_jobs(args.n, args.seed):
+            f.write(json.dumps(job, ensure_ascii=False))
+            f.write("\n")
+    print(f"[bench] Wrote {args.n} synthetic postings to {path}")
+
+
+if __name__ == "__main__":
+    main()
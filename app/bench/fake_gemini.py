@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+# Local stand-in for the Gemini REST API (generateContent), for load tests.
+# Point the API at it with GEMINI_API_ENDPOINT=http://127.0.0.1:8090 (any
+# GEMINI_API_KEY). Latency and 429 injection are set on the command line.
+
+def create_app(latency_ms: float = 800.0, jitter_ms: float = 200.0, rate_429: float = 0.0, seed: int = 0) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(seed)
+    stats = {"requests": 0, "throttled": 0}
+
+    @app.post("/{version}/models/{model_action:path}")
+    async def generate_content(version: str, model_action: str, request: Request):
+        stats["requests"] += 1
+        body = await request.json()
+        if rng.random() < rate_429:
+            stats["throttled"] += 1
+            return JSONResponse(
+                {"error": {"code": 429, "message": "Resource has been exhausted (e.g. check quota).", "status": "RESOURCE_EXHAUSTED"}},
+                status_code=429,
+            )
+        await asyncio.sleep(max(0.0, rng.gauss(latency_ms, jitter_ms)) / 1000)
+
+        prompt = "".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []))
+        titles = [line[len("Title: "):] for line in prompt.splitlines() if line.startswith("Title: ")]
+        text = "\n".join(f"- {t}" for t in titles[:5]) or "I don't have that information in the provided context."
+        return {
+            "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4},
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini generateContent stand-in")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=200.0)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of calls answered with 429")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args.latency_ms, args.jitter_ms, args.rate_429), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import re
+import time
+import zlib
+from typing import List
+
+import numpy as np
+
+
+# Deterministic local stand-ins so benchmarks measure our code, not a model
+# download or a network round trip.
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+class HashEmbedder:
+    # Feature-hashing bag of words: same text -> same vector on every run and
+    # machine (crc32, not hash()). Vectors are L2-normalized like real ones.
+    def __init__(self, dim: int = 384) -> None:
+        self.dim = dim
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            codes = [zlib.crc32(tok.encode()) for tok in _TOKEN.findall(text.lower())]
+            if not codes:
+                continue
+            codes = np.asarray(codes, dtype=np.uint32)
+            signs = np.where(codes & 1, 1.0, -1.0).astype(np.float32)
+            np.add.at(out[i], (codes >> 1) % self.dim, signs)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1, norms)
+
+
+class StubLLM:
+    # Stands in for Gemini in RAGService(llm=...): answers from the prompt's
+    # context with optional fixed latency, never fails, never calls out
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    def __call__(self, prompt: str) -> str:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        titles = [line[len("Title: "):] for line in prompt.splitlines() if line.startswith("Title: ")]
+        if not titles:
+            return "I don't have that information in the provided context."
+        return "\n".join(f"- {t}" for t in titles[:5])
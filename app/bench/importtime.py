@@ -0,0 +1,65 @@
+import argparse
+import subprocess
+import sys
+from typing import Dict, List
+
+from app.bench import write_results
+
+
+# Heavy dependencies that must stay off the API import path; they are loaded
+# by the lifespan warmup (app.main.warm_up) instead
+HEAVY = ["chromadb", "google.generativeai", "sentence_transformers", "torch", "onnxruntime"]
+
+
+def measure(module: str) -> List[Dict]:
+    # python -X importtime writes "import time: self [us] | cumulative | name"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        # Nesting is encoded as extra indentation after the single separator space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append({
+            "module": name.strip(),
+            "depth": depth,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cum_us) / 1000,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report what importing the API costs")
+    parser.add_argument("--module", type=str, default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--out", type=str, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    rows = measure(args.module)
+    top_level = [r for r in rows if r["depth"] == 0]
+    total_ms = sum(r["cumulative_ms"] for r in top_level)
+    loaded = {r["module"] for r in rows}
+    heavy = [m for m in HEAVY if m in loaded]
+
+    print(f"[importtime] import {args.module}: {total_ms:.1f} ms across {len(rows)} modules")
+    for r in sorted((r for r in rows if 1 <= r["depth"] <= 2), key=lambda r: -r["cumulative_ms"])[: args.top]:
+        print(f"  {r['cumulative_ms']:>9.1f} ms  {'  ' * (r['depth'] - 1)}{r['module']}")
+    if heavy:
+        print(f"[importtime] WARNING heavy dependencies imported eagerly: {', '.join(heavy)}")
+    else:
+        print("[importtime] No heavy dependencies on the import path.")
+
+    if args.out:
+        write_results(args.out, "importtime", {"module": args.module, "total_ms": round(total_ms, 1), "heavy": heavy, "modules": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from app.bench import percentiles, write_results
+from app.bench.corpus import DEFAULT_LLM_SHARE, llm_share_of, query_mix
+
+
+# Load generator for /api/chat. Open loop (--rates: fixed arrival rate per
+# step, so queueing shows up as latency) or closed loop (--concurrency).
+# Each step prints per-window throughput, latency percentiles and
+# error/fallback rates; the summary marks the first saturated step.
+#
+#   python -m app.bench.fake_gemini --latency-ms 800 --rate-429 0.05 &
+#   GEMINI_API_KEY=x GEMINI_API_ENDPOINT=http://127.0.0.1:8090 uvicorn app.main:app &
+#   python -m app.bench.load --rates 2 5 10 20 --duration 30
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.sent = 0
+        self.errors = 0
+        self.fallbacks = 0
+        self.dropped = 0
+        self.status: Dict[str, int] = {}
+        self.paths: Dict[str, int] = {}
+
+    def record(self, latency_ms: float, status: str, path: Optional[str]) -> None:
+        self.latencies.append(latency_ms)
+        self.status[status] = self.status.get(status, 0) + 1
+        if status != "200":
+            self.errors += 1
+            return
+        if path:
+            self.paths[path] = self.paths.get(path, 0) + 1
+        if path == "fallback":
+            self.fallbacks += 1
+
+    def merge(self, other: "Stats") -> None:
+        self.latencies.extend(other.latencies)
+        self.sent += other.sent
+        self.errors += other.errors
+        self.fallbacks += other.fallbacks
+        self.dropped += other.dropped
+        for k, v in other.status.items():
+            self.status[k] = self.status.get(k, 0) + v
+        for k, v in other.paths.items():
+            self.paths[k] = self.paths.get(k, 0) + v
+
+    def summary(self, seconds: float) -> Dict:
+        done = len(self.latencies)
+        answered = sum(self.paths.values())
+        return {
+            "sent": self.sent,
+            "completed": done,
+            "dropped": self.dropped,
+            "throughput_rps": round(done / seconds, 2) if seconds else 0.0,
+            "latency_ms": percentiles(self.latencies),
+            "error_rate": round(self.errors / done, 4) if done else 0.0,
+            "fallback_rate": round(self.fallbacks / done, 4) if done else 0.0,
+            # Answers that called the LLM (fallback = it was called and failed)
+            "llm_share": round((self.paths.get("llm", 0) + self.fallbacks) / answered, 4) if answered else 0.0,
+            "answer_paths": dict(self.paths),
+            "status": dict(self.status),
+        }
+
+
+class Step:
+    # Totals for the whole step plus the current reporting window
+    def __init__(self) -> None:
+        self.total = Stats()
+        self.window = Stats()
+
+    def sent(self) -> None:
+        self.total.sent += 1
+        self.window.sent += 1
+
+    def dropped(self) -> None:
+        self.total.dropped += 1
+        self.window.dropped += 1
+
+    def record(self, latency_ms: float, status: str, path: Optional[str]) -> None:
+        self.total.record(latency_ms, status, path)
+        self.window.record(latency_ms, status, path)
+
+
+async def send(client, query: str, step: Step) -> None:
+    import httpx
+    step.sent()
+    t0 = time.perf_counter()
+    status = "exception"
+    path = None
+    try:
+        resp = await client.post("/api/chat", json={"query": query})
+        status = str(resp.status_code)
+        if resp.status_code == 200:
+            path = resp.json().get("answerPath")
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    step.record((time.perf_counter() - t0) * 1000, status, path)
+
+
+async def report(step: Step, windows: List[Dict], interval: float, label: str, stop: asyncio.Event) -> None:
+    started = last = time.perf_counter()
+    prev: Optional[Stats] = None
+    prev_start = started
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        now = time.perf_counter()
+        window, step.window = step.window, Stats()
+        window_start = last
+        if stop.is_set() and prev is not None and now - last < interval / 4:
+            # Fold the short drain tail into the previous window rather than
+            # reporting a rate over a few milliseconds
+            prev.merge(window)
+            window, window_start = prev, prev_start
+            windows.pop()
+        row = window.summary(now - window_start)
+        row["t"] = round(now - started, 1)
+        windows.append(row)
+        prev, prev_start, last = window, window_start, now
+        lat = row["latency_ms"]
+        print(
+            f"[load] {label} t={row['t']:>6.1f}s rps={row['throughput_rps']:>7.2f} "
+            f"p50={lat['p50']:>8.1f} p95={lat['p95']:>8.1f} p99={lat['p99']:>8.1f} ms "
+            f"err={row['error_rate']:.1%} fallback={row['fallback_rate']:.1%} llm={row['llm_share']:.0%}"
+            + (f" dropped={row['dropped']}" if row["dropped"] else "")
+        )
+
+
+async def run_step(
+    url: str,
+    queries: List[str],
+    duration: float,
+    interval: float,
+    rate: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    max_inflight: int = 256,
+    timeout: float = 60.0,
+) -> Dict:
+    import httpx
+    step = Step()
+    windows: List[Dict] = []
+    label = f"rate={rate:g}/s" if rate else f"conc={concurrency}"
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=max_inflight, max_keepalive_connections=max_inflight)
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        reporter = asyncio.create_task(report(step, windows, interval, label, stop))
+        started = time.perf_counter()
+        deadline = started + duration
+
+        if rate:
+            inflight: set = set()
+            i = 0
+            while started + i / rate < deadline:
+                await asyncio.sleep(max(0.0, started + i / rate - time.perf_counter()))
+                if len(inflight) >= max_inflight:
+                    # Client-side cap reached: the server is far past saturation
+                    step.dropped()
+                else:
+                    task = asyncio.create_task(send(client, queries[i % len(queries)], step))
+                    inflight.add(task)
+                    task.add_done_callback(inflight.discard)
+                i += 1
+            if inflight:
+                await asyncio.wait(inflight, timeout=timeout)
+        else:
+            next_query = iter(range(10 ** 12))
+
+            async def user():
+                while time.perf_counter() < deadline:
+                    await send(client, queries[next(next_query) % len(queries)], step)
+
+            await asyncio.gather(*(user() for _ in range(concurrency)))
+
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await reporter
+
+    row = step.total.summary(elapsed)
+    row.update({"target_rps": rate, "concurrency": concurrency, "duration_s": round(elapsed, 1), "windows": windows})
+    return row
+
+
+def saturated(row: Dict, max_error_rate: float, max_p99_ms: Optional[float]) -> bool:
+    if row["error_rate"] > max_error_rate or row["dropped"]:
+        return True
+    if row["target_rps"] and row["throughput_rps"] < 0.9 * row["target_rps"]:
+        return True
+    return bool(max_p99_ms and row["latency_ms"]["p99"] > max_p99_ms)
+
+
+async def run(args) -> Dict:
+    queries = query_mix(args.queries, seed=args.seed, llm_share=args.llm_share)
+    print(f"[load] Query mix: {len(queries)} queries, {llm_share_of(queries):.0%} routed to the LLM by detect_field")
+    steps = [("rate", r) for r in args.rates or []] + [("conc", c) for c in args.concurrency or []]
+    results = []
+    for kind, value in steps:
+        row = await run_step(
+            args.url,
+            queries,
+            args.duration,
+            args.window,
+            rate=value if kind == "rate" else None,
+            concurrency=value if kind == "conc" else None,
+            max_inflight=args.max_inflight,
+            timeout=args.timeout,
+        )
+        row["saturated"] = saturated(row, args.max_error_rate, args.max_p99_ms)
+        results.append(row)
+    return {"url": args.url, "mix_llm_share": round(llm_share_of(queries), 4), "steps": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /api/chat")
+    parser.add_argument("--url", type=str, default="http://127.0.0.1:8000")
+    parser.add_argument("--rates", type=float, nargs="+", help="Open-loop steps, requests per second")
+    parser.add_argument("--concurrency", type=int, nargs="+", help="Closed-loop steps, concurrent users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per step")
+    parser.add_argument("--window", type=float, default=5.0, help="Reporting interval in seconds")
+    parser.add_argument("--queries", type=int, default=500, help="Size of the replayed query mix")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--llm-share", type=float, default=DEFAULT_LLM_SHARE,
+        help="Share of the mix drawn from LLM-path queries; the rest name a field and are answered without Gemini",
+    )
+    parser.add_argument("--max-inflight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Saturation threshold")
+    parser.add_argument("--max-p99-ms", type=float, help="Optional latency SLO for saturation")
+    parser.add_argument("--out", type=str, default="bench_results/load.json")
+    args = parser.parse_args()
+    if not args.rates and not args.concurrency:
+        parser.error("Provide --rates and/or --concurrency")
+
+    results = asyncio.run(run(args))
+    print("[load] step summary:")
+    first = None
+    for row in results["steps"]:
+        label = f"rate={row['target_rps']:g}/s" if row["target_rps"] else f"conc={row['concurrency']}"
+        lat = row["latency_ms"]
+        flag = "SATURATED" if row["saturated"] else "ok"
+        print(
+            f"  {label:<14} rps={row['throughput_rps']:>7.2f} p50={lat['p50']:>8.1f} p99={lat['p99']:>8.1f} ms "
+            f"err={row['error_rate']:.1%} fallback={row['fallback_rate']:.1%} llm={row['llm_share']:.0%} {flag}"
+        )
+        if row["saturated"] and first is None:
+            first = label
+    print(f"[load] First saturated step: {first}" if first else "[load] No step saturated.")
+    write_results(args.out, "load", results)
+
+
+if __name__ == "__main__":
+    main()
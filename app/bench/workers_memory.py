@@ -0,0 +1,55 @@
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+from app.bench import write_results
+
+
+# Per-process memory for a gunicorn master and its workers, from
+# /proc/<pid>/smaps_rollup (Linux). PSS splits shared pages between the
+# processes mapping them, so with a shared index the per-worker PSS and
+# private (USS) numbers should stay flat as workers are added.
+
+def children(pid: int) -> List[int]:
+    out: List[int] = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        text = (task / "children").read_text().split()
+        out.extend(int(c) for c in text)
+    return out
+
+
+def rollup(pid: int) -> Dict[str, float]:
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        fields[key.strip()] = int(value.split()[0]) / 1024
+    return {
+        "rss_mb": round(fields.get("Rss", 0), 1),
+        "pss_mb": round(fields.get("Pss", 0), 1),
+        "uss_mb": round(fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0), 1),
+        "shared_mb": round(fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report memory of a gunicorn master and its workers")
+    parser.add_argument("master_pid", type=int)
+    parser.add_argument("--out", type=str)
+    args = parser.parse_args()
+
+    report = {"master": rollup(args.master_pid), "workers": {}}
+    print(f"[memory] master {args.master_pid}: {report['master']}")
+    for pid in children(args.master_pid):
+        report["workers"][str(pid)] = rollup(pid)
+        print(f"[memory] worker {pid}: {report['workers'][str(pid)]}")
+    workers = list(report["workers"].values())
+    if workers:
+        report["worker_pss_mb_avg"] = round(sum(w["pss_mb"] for w in workers) / len(workers), 1)
+        report["total_pss_mb"] = round(report["master"]["pss_mb"] + sum(w["pss_mb"] for w in workers), 1)
+        print(f"[memory] {len(workers)} workers, avg PSS {report['worker_pss_mb_avg']} MB, total PSS {report['total_pss_mb']} MB")
+    if args.out:
+        write_results(args.out, "workers_memory", report)
+
+
+if __name__ == "__main__":
+    main()
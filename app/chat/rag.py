@@ -1,14 +1,182 @@
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Iterable, Optional, Tuple
+from collections import OrderedDict
 import os
-import chromadb
+import threading
+import time
 from app.chat.prompts import SYSTEM_PROMPT
+from app.ingest.vectorstore import alias_mtime, resolve_alias
+from app.ingest.snapshot import load_snapshot, snapshot_to_collection
+from app.chat.stores import ChromaStore, NumpyStore, VectorStore
+from app.chat import shared
+from app import metrics
+from app.chat.sessions import field_value
+
+
+def detect_field(query: str) -> Optional[str]:
+    # Metadata field a query asks about, if any
+    ql = query.lower()
+    if "qualification" in ql:
+        return "qualification"
+    if "experience" in ql:
+        return "experienceRequired"
+    if "vacanc" in ql or "opening" in ql:
+        return "numVacancies"
+    if "salary" in ql:
+        return "salary"
+    if "last date" in ql or "deadline" in ql:
+        return "lastDate"
+    return None
+
+
+def format_field_answer(field_name: str, meta: Dict, value) -> str:
+    title = meta.get("postTitle", "")
+    org = meta.get("organizationName", "")
+    src = meta.get("sourceUrl", "")
+    field_label = field_name.replace("Required", "").title()
+    return f"{field_label} for '{title}' ({org}): {value}\nSource: {src}"
+
+
+def gemini_generate(prompt: str) -> str:
+    import google.generativeai as genai
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("Missing GEMINI_API_KEY")
+    endpoint = os.getenv("GEMINI_API_ENDPOINT")
+    if endpoint:
+        # e.g. http://127.0.0.1:8090 for the local stand-in (app.bench.fake_gemini)
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+    else:
+        genai.configure(api_key=api_key)
+    model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+    model = genai.GenerativeModel(model_name)
+    out = model.generate_content(prompt)
+    return out.text if hasattr(out, "text") else str(out)
 
 
 class RAGService:
-    def __init__(self, collection_name: str = "jobyaari_jobs") -> None:
-        persist_dir = os.getenv("CHROMA_PERSIST_DIR", ".chroma")
-        self.client = chromadb.PersistentClient(path=persist_dir)
-        self.collection = self.client.get_collection(collection_name)
+    def __init__(
+        self,
+        collection_name: str = "jobyaari_jobs",
+        store: Optional[VectorStore] = None,
+        llm: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        # store / llm are injection points for benchmarks and tests; by default
+        # the backend comes from the environment and answers from Gemini
+        self.llm = llm or gemini_generate
+        self.snapshot_dir = os.getenv("SNAPSHOT_DIR")
+        self.backend = store.name if store else shared.vector_backend()
+        if self.backend == "numpy" and not (store or self.snapshot_dir):
+            raise RuntimeError("VECTOR_BACKEND=numpy needs SNAPSHOT_DIR")
+        self.persist_dir = os.getenv("CHROMA_PERSIST_DIR", ".chroma")
+        # EMBEDDER_URL: embed queries via the shared embedder service instead
+        # of loading a model in every worker
+        self.embed_fn = shared.query_embedder()
+        self.store: VectorStore
+        self.client = None
+        if store or self.snapshot_dir:
+            # Injected store, or a prebuilt snapshot served from memory:
+            # no ingest, no document embeddings, no alias to follow
+            self.persist_dir = None
+            if not store and self.backend == "chroma":
+                import chromadb
+                self.client = chromadb.EphemeralClient()
+        else:
+            import chromadb
+            self.client = chromadb.PersistentClient(path=self.persist_dir)
+        # collection_name is an alias when ingest builds versioned collections,
+        # otherwise it is the collection itself
+        self.alias = collection_name
+        self.collection_name: Optional[str] = None
+        self._alias_mtime = None
+        self._refresh_lock = threading.Lock()
+        # Called after refresh_collection rebinds to another collection
+        self.on_rebind: List[Callable[[], None]] = []
+        # LRU of retrieve() results, tagged with the category they filtered on
+        self._cache: "OrderedDict[Tuple, Tuple[Optional[str], Dict]]" = OrderedDict()
+        self._cache_size = int(os.getenv("RETRIEVAL_CACHE_SIZE", "256"))
+        self._cache_lock = threading.Lock()
+        self._cache_gen = 0
+        if store:
+            self.store = store
+            self.collection_name = collection_name
+        elif self.snapshot_dir and self.backend == "numpy":
+            # Reuse the index the gunicorn master preloaded before fork, if any
+            self.store = shared.preloaded_store() or NumpyStore.from_snapshot(
+                load_snapshot(self.snapshot_dir), embed_fn=self.embed_fn
+            )
+            self.collection_name = collection_name
+        elif self.snapshot_dir:
+            # VECTOR_BACKEND=chroma: every vector is re-inserted into an in-memory
+            # HNSW index, so startup scales with the corpus, not with the mmap
+            snap = load_snapshot(self.snapshot_dir)
+            self.store = ChromaStore(snapshot_to_collection(snap, self.client, collection_name), embed_fn=self.embed_fn)
+            self.collection_name = collection_name
+        else:
+            self.refresh_collection(force=True)
+
+    def refresh_collection(self, force: bool = False) -> bool:
+        # Cheap stat of the alias record; rebind only when ingest flipped it
+        if self.persist_dir is None:
+            return False
+        mtime = alias_mtime(self.persist_dir)
+        if not force and mtime == self._alias_mtime:
+            return False
+        with self._refresh_lock:
+            rebound = self._rebind(mtime)
+        if rebound:
+            for callback in self.on_rebind:
+                callback()
+        return rebound
+
+    def _rebind(self, mtime) -> bool:
+        name = resolve_alias(self.persist_dir, self.alias) or self.alias
+        rebound = False
+        if name != self.collection_name:
+            # Single attribute assignment, so in-flight requests keep the old handle
+            self.store = ChromaStore(self.client.get_collection(name), embed_fn=self.embed_fn)
+            self.collection_name = name
+            self.invalidate_cache()
+            rebound = True
+        self._alias_mtime = mtime
+        return rebound
+
+    def live_store(self) -> VectorStore:
+        # Store to write to, following alias flips even when no query comes in
+        try:
+            self.refresh_collection()
+        except Exception:
+            pass
+        return self.store
+
+    def warmup(self) -> Dict[str, float]:
+        # Pay the first-call costs (embedder load, first embedding, index load)
+        # before the worker reports ready; bypasses the retrieval cache
+        timings = {}
+        t0 = time.perf_counter()
+        timings["documents"] = self.store.count()
+        timings["count_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        t0 = time.perf_counter()
+        self.store.query(query_texts=["latest engineering notifications"], n_results=1)
+        timings["first_query_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return timings
+
+    def invalidate_cache(self, categories: Optional[Iterable[Optional[str]]] = None) -> int:
+        # Drop cached retrievals that new documents could change: everything when
+        # categories is None, else entries for those categories or unscoped ones
+        with self._cache_lock:
+            self._cache_gen += 1
+            if categories is None:
+                n = len(self._cache)
+                self._cache.clear()
+                return n
+            cats = {str(c).lower() for c in categories if c}
+            stale = [k for k, (cat, _) in self._cache.items() if cat is None or cat in cats]
+            for k in stale:
+                del self._cache[k]
+            return len(stale)
+
+    def on_documents_upserted(self, metadatas: List[Dict]) -> None:
+        self.invalidate_cache(m.get("category") for m in metadatas)
 
     def _extract_filters_from_query(self, query: str) -> Tuple[Optional[Dict], List[Dict]]:
         # returns (where_filter_for_chroma, post_filters)
@@ -89,8 +257,26 @@ class RAGService:
         return [m for m in metas if match(m)]
 
     def retrieve(self, query: str, filters: Optional[Dict] = None, top_k: int = 8) -> Dict:
+        try:
+            self.refresh_collection()
+        except Exception:
+            # Alias points at a collection we cannot open yet; keep the current one
+            pass
+        cache_key = (query, tuple(sorted((filters or {}).items())), top_k)
+        cache_gen = self._cache_gen
+        if self._cache_size > 0:
+            with self._cache_lock:
+                hit = self._cache.get(cache_key)
+                if hit is not None:
+                    self._cache.move_to_end(cache_key)
+            if hit is not None:
+                metrics.inc("jobyaari_retrieval_cache_total", result="hit")
+                return hit[1]
+            metrics.inc("jobyaari_retrieval_cache_total", result="miss")
+
         # Build filters from query if UI did not pass structured filters
-        where, post_filters = self._extract_filters_from_query(query)
+        with metrics.stage("filters"):
+            where, post_filters = self._extract_filters_from_query(query)
         # If caller provided filters, merge
         if filters:
             clauses = []
@@ -110,10 +296,8 @@ class RAGService:
             elif len(clauses) > 1:
                 where = {"$and": clauses}
 
-        if where:
-            res = self.collection.query(query_texts=[query], n_results=top_k, where=where)
-        else:
-            res = self.collection.query(query_texts=[query], n_results=top_k)
+        with metrics.stage("vector_query"):
+            res = self.store.query(query_texts=[query], n_results=top_k, where=where or None)
 
         # Apply post-filters to ensure constraints like vacancies > N are respected
         metas = res.get("metadatas", [[]])[0]
@@ -129,9 +313,66 @@ class RAGService:
                     kept_docs.append(doc)
             res["metadatas"] = [kept]
             res["documents"] = [kept_docs]
+
+        if self._cache_size > 0:
+            scope = None
+            for clause in (where.get("$and", [where]) if where else []):
+                if "category" in clause:
+                    scope = str(clause["category"]).lower()
+            with self._cache_lock:
+                # Skip the store if an invalidation raced with this query
+                if cache_gen != self._cache_gen:
+                    return res
+                self._cache[cache_key] = (scope, res)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
         return res
 
-    def generate(self, query: str, retrieved: Dict) -> Dict:
+    def chat(self, query: str, filters: Optional[Dict] = None, session=None) -> Dict:
+        # One conversational turn. With a session, follow-ups that refer to the
+        # previous results are answered from the cached postings first
+        if session is not None and not filters:
+            result = self.answer_followup(query, session)
+            if result is not None:
+                session.add_turn(query, result["answer"])
+                return result
+
+        with metrics.stage("retrieve"):
+            retrieved = self.retrieve(query, filters)
+        history = list(session.history) if session is not None else None
+        with metrics.stage("generate"):
+            result = self.generate(query, retrieved, history=history)
+        target = result.pop("_target", None)
+        if session is not None:
+            session.remember(retrieved)
+            if target:
+                session.target = (target["metadata"], target["document"])
+            session.add_turn(query, result["answer"])
+        return result
+
+    def answer_followup(self, query: str, session) -> Optional[Dict]:
+        ref = session.resolve(query)
+        if ref is None:
+            return None
+        meta, doc = ref
+        session.target = ref
+        field_name = detect_field(query)
+        if field_name:
+            # Metadata-only path: no vector query, no LLM
+            value = field_value(field_name, meta, doc)
+            answer = format_field_answer(field_name, meta, value if value is not None else "Not specified")
+            metrics.inc("jobyaari_followups_total", path="field")
+            metrics.inc("jobyaari_answers_total", path="field")
+            return {"answer": answer, "results": [], "sources": [meta.get("sourceUrl")], "answerPath": "field"}
+
+        # Anything else about that posting: LLM over its cached passage only
+        metrics.inc("jobyaari_followups_total", path="cached_context")
+        with metrics.stage("generate"):
+            result = self.generate(query, {"metadatas": [[meta]], "documents": [[doc]]}, history=list(session.history))
+        result.pop("_target", None)
+        return result
+
+    def generate(self, query: str, retrieved: Dict, history: Optional[List[Tuple[str, str]]] = None) -> Dict:
         # Build context
         docs = retrieved.get("documents", [[]])[0]
         metas = retrieved.get("metadatas", [[]])[0]
@@ -162,12 +403,12 @@ class RAGService:
         def retrieve_by_title(title: str):
             # Title-only retrieval to bias vector search towards the exact post
             try:
-                return self.collection.query(query_texts=[title], n_results=25)
+                with metrics.stage("title_query"):
+                    return self.store.query(query_texts=[title], n_results=25)
             except Exception:
                 return None
 
         # If the user asked for a specific field for a given post, prefer exact title match across the whole collection
-        ql = query.lower()
         def select_best_by_title(q: str, candidates: List[Dict]) -> Optional[Dict]:
             if not candidates:
                 return None
@@ -186,41 +427,32 @@ class RAGService:
             return best
 
         field_direct = None
-        field_name = None
+        field_name = detect_field(query)
         target_meta = None
-        if "qualification" in ql:
-            field_name = "qualification"
-        elif "experience" in ql:
-            field_name = "experienceRequired"
-        elif "vacanc" in ql or "opening" in ql:
-            field_name = "numVacancies"
-        elif "salary" in ql:
-            field_name = "salary"
-        elif "last date" in ql or "deadline" in ql:
-            field_name = "lastDate"
 
         if field_name:
             title_hint = extract_title_from_query(query)
             search_metas = metas
+            search_docs = docs
             # If a title is hinted, do a dedicated retrieval using only the title
             if title_hint:
                 rer = retrieve_by_title(title_hint)
-                if rer:
-                    search_metas = rer.get("metadatas", [[]])[0] or metas
+                if rer and rer.get("metadatas", [[]])[0]:
+                    search_metas = rer["metadatas"][0]
+                    search_docs = rer.get("documents", [[]])[0]
             # Select best match from the search set
             target_meta = select_best_by_title(query, search_metas)
             if target_meta and target_meta.get(field_name) is not None:
-                val = target_meta.get(field_name)
-                title = target_meta.get("postTitle", "")
-                org = target_meta.get("organizationName", "")
-                src = target_meta.get("sourceUrl", "")
-                field_label = field_name.replace("Required", "").title()
-                field_direct = f"{field_label} for '{title}' ({org}): {val}\nSource: {src}"
+                field_direct = format_field_answer(field_name, target_meta, target_meta.get(field_name))
 
         if field_direct:
+            metrics.inc("jobyaari_answers_total", path="field")
             results = []
             sources = [target_meta.get("sourceUrl")] if target_meta else []
-            return {"answer": field_direct, "results": results, "sources": sources}
+            i = search_metas.index(target_meta)
+            # _target lets chat() remember the posting for follow-ups; not part of the API response
+            target = {"metadata": target_meta, "document": search_docs[i] if i < len(search_docs) else ""}
+            return {"answer": field_direct, "results": results, "sources": sources, "answerPath": "field", "_target": target}
 
         # Generate with Gemini, but fail gracefully with a deterministic fallback
         def fallback_answer() -> str:
@@ -236,19 +468,20 @@ class RAGService:
         answer = None
         used_fallback = False
         try:
-            import google.generativeai as genai
-            api_key = os.getenv("GEMINI_API_KEY")
-            if not api_key:
-                raise RuntimeError("Missing GEMINI_API_KEY")
-            genai.configure(api_key=api_key)
-            model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-            model = genai.GenerativeModel(model_name)
-            prompt = f"{SYSTEM_PROMPT}\n\nContext:\n{context_text}\n\nUser Query: {query}\n\nAnswer:"
-            out = model.generate_content(prompt)
-            answer = out.text if hasattr(out, "text") else str(out)
-        except Exception:
+            history_text = ""
+            if history:
+                turns = "\n".join(f"User: {q}\nAssistant: {a}" for q, a in history)
+                history_text = f"\n\nConversation so far:\n{turns}"
+            prompt = f"{SYSTEM_PROMPT}\n\nContext:\n{context_text}{history_text}\n\nUser Query: {query}\n\nAnswer:"
+            metrics.observe("jobyaari_prompt_chars", len(prompt))
+            metrics.observe("jobyaari_context_documents", len(context_blocks))
+            with metrics.stage("llm"):
+                answer = self.llm(prompt)
+        except Exception as e:
+            metrics.inc("jobyaari_llm_errors_total", error=type(e).__name__)
             answer = fallback_answer()
             used_fallback = True
+        metrics.inc("jobyaari_answers_total", path="fallback" if used_fallback else "llm")
 
         # Prepare compact results list
         results = []
@@ -269,6 +502,7 @@ class RAGService:
         if used_fallback:
             # Avoid duplicate rendering in UI by returning the list only in the answer
             results = []
-        return {"answer": answer, "results": results, "sources": sources}
+        answer_path = "fallback" if used_fallback else "llm"
+        return {"answer": answer, "results": results, "sources": sources, "answerPath": answer_path}
 
 
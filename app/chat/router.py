@@ -1,30 +1,64 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, Dict
-from .rag import RAGService
 
 
 router = APIRouter(prefix="/api")
-rag_service = RAGService()
 
 
 class ChatRequest(BaseModel):
     query: str
     filters: Optional[Dict[str, str]] = None
+    # "new" starts a conversation; then send back the id from the response.
+    # Omitted: a stateless one-off question, no session is kept.
+    sessionId: Optional[str] = None
+
+
+NEW_SESSION = "new"
+
+
+def get_rag_service(request: Request):
+    # Built by the lifespan warmup in app.main; 503 until it is ready
+    rag_service = getattr(request.app.state, "rag_service", None)
+    if rag_service is None:
+        raise HTTPException(status_code=503, detail="Service is warming up")
+    return rag_service
 
 
 @router.get("/health")
+@router.get("/health/live")
 async def health():
+    # Liveness: the process is up and serving HTTP
     return {"status": "ok"}
 
 
+@router.get("/health/ready")
+async def ready(request: Request):
+    # Readiness: the index is open and the first embedding + query succeeded
+    startup = getattr(request.app.state, "startup", {"status": "starting"})
+    code = 200 if startup.get("status") == "ready" else 503
+    return JSONResponse(startup, status_code=code)
+
+
 @router.post("/chat")
-async def chat(req: ChatRequest):
+def chat(req: ChatRequest, request: Request, rag_service=Depends(get_rag_service)):
+    # Plain def: FastAPI runs it in the threadpool, so the blocking vector query
+    # and Gemini call never stall the event loop (or the health probes on it)
     filters = req.filters or None
     if isinstance(filters, dict) and len(filters) == 0:
         filters = None
-    retrieved = rag_service.retrieve(req.query, filters)
-    result = rag_service.generate(req.query, retrieved)
+    sessions = request.app.state.sessions
+    session = None
+    if req.sessionId == NEW_SESSION:
+        session = sessions.create()
+    elif req.sessionId:
+        session = sessions.get(req.sessionId)
+        if session is None:
+            # Never swap in a fresh session: the follow-up would silently turn
+            # into a new search. Expired, evicted, or created by another worker.
+            raise HTTPException(status_code=404, detail="Unknown or expired sessionId; send \"new\" to start a new session")
+    result = rag_service.chat(req.query, filters, session)
+    if session is not None:
+        result["sessionId"] = session.id
     return result
-
-
@@ -0,0 +1,196 @@
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+
+# Server-side chat sessions: a bounded LRU of recent conversations with TTL
+# eviction. Each session keeps the postings from its last retrieval (metadata
+# and document text) and a short history, so follow-ups such as "what's the
+# salary for that one?" are answered without another vector query.
+
+ORDINALS = {
+    "first": 0, "1st": 0, "second": 1, "2nd": 1, "third": 2, "3rd": 2,
+    "fourth": 3, "4th": 3, "fifth": 4, "5th": 4,
+}
+ORDINAL_RE = re.compile(r"\b(first|1st|second|2nd|third|3rd|fourth|4th|fifth|5th)\b|(?:#|\bno\.?\s*|\bnumber\s+)(\d+)\b")
+# Explicit references only: bare "it"/"one"/"this" show up in plenty of new
+# questions ("Is it possible to apply...", "Is there one with...")
+REFERENCE_RE = re.compile(
+    r"\b(?:that|this|the|same|last|above|previous)\s+(?:one|post|job|posting|vacancy)\b"
+    r"|\b(?:for|about|of|on|to|in)\s+(?:it|that|this)\b"
+    r"|\bits\b"
+)
+# Phrasings that start a fresh search rather than point at earlier results
+NEW_SEARCH_RE = re.compile(
+    r"\b(engineering|science|commerce|education|latest|notifications|show me|list|find|search|other|more jobs"
+    r"|is there|are there|any|more than|less than|fewer than|at least|at most)\b"
+)
+STOPWORDS = {
+    "what", "whats", "the", "for", "that", "this", "one", "and", "about", "with", "which", "post",
+    "job", "jobs", "salary", "qualification", "experience", "vacancy", "vacancies", "last", "date",
+    "deadline", "opening", "openings", "tell", "how", "many", "much", "is", "are", "its", "there",
+    "can", "could", "you", "please", "give", "does", "was", "required", "needed", "posting", "same",
+    "previous", "above", "also", "then", "again", "pay", "age", "limit", "location", "where", "when",
+}
+# Labels job_to_document writes into the passage, for fields not kept in metadata
+DOC_LABELS = {
+    "salary": "Salary",
+    "qualification": "Qualification",
+    "experienceRequired": "Experience",
+    "numVacancies": "Vacancies",
+    "lastDate": "Last Date",
+    "location": "Location",
+    "ageRequirement": "Age",
+}
+
+
+class Session:
+    def __init__(self, session_id: str, max_turns: int) -> None:
+        self.id = session_id
+        self.metas: List[Dict] = []
+        self.docs: List[str] = []
+        self.target: Optional[Tuple[Dict, str]] = None
+        self.history: deque = deque(maxlen=max_turns)
+        self.updated_at = time.monotonic()
+
+    def remember(self, retrieved: Dict) -> None:
+        self.metas = list(retrieved.get("metadatas", [[]])[0])
+        self.docs = list(retrieved.get("documents", [[]])[0])
+        self.target = None
+
+    def add_turn(self, query: str, answer: str, max_chars: int = 240) -> None:
+        # Compact history: answers are clipped, only the last max_turns kept
+        self.history.append((query, answer if len(answer) <= max_chars else answer[:max_chars] + "…"))
+
+    def resolve(self, query: str) -> Optional[Tuple[Dict, str]]:
+        # Posting a follow-up refers to, or None to run a fresh retrieval. When
+        # in doubt this returns None: a new search costs a vector query, a
+        # wrong binding answers about the wrong posting.
+        if not self.metas and not self.target:
+            return None
+        q = query.lower()
+        m = ORDINAL_RE.search(q)
+        if m:
+            i = ORDINALS[m.group(1)] if m.group(1) else int(m.group(2)) - 1
+            if 0 <= i < len(self.metas):
+                return self.metas[i], self._doc(i)
+            return None
+        if NEW_SEARCH_RE.search(q):
+            return None
+
+        words = {w for w in _words(q) if len(w) > 2 and w not in STOPWORDS}
+        if REFERENCE_RE.search(q):
+            # "Tell me more about it", "Is that one still open?": ordinary words
+            # do not cancel the reference, only entity-like ones do (a word from
+            # a cached posting's title/org/location, or a capitalized name).
+            # Those pick the posting they all belong to, or mean a new search.
+            entities = {w for w in words if w in self._vocabulary() or w in _proper_nouns(query)}
+            if not entities:
+                if self.target:
+                    return self.target
+                return (self.metas[0], self._doc(0)) if len(self.metas) == 1 else None
+            return self._unique_match(entities)
+
+        # Without a reference, a query with words of its own binds only if every
+        # one of them belongs to exactly one cached posting ("salary for the IIT
+        # Ropar JRF"); any word outside it ("... at IIT Delhi", "railway") means
+        # a new search
+        if words:
+            return self._unique_match(words)
+        return None
+
+    def _unique_match(self, words: set) -> Optional[Tuple[Dict, str]]:
+        # The posting under discussion first, then exactly one cached posting
+        if self.target and words <= _posting_words(self.target[0]):
+            return self.target
+        matches = [i for i, meta in enumerate(self.metas) if words <= _posting_words(meta)]
+        if len(matches) == 1:
+            return self.metas[matches[0]], self._doc(matches[0])
+        return None
+
+    def _vocabulary(self) -> set:
+        vocab = set()
+        for meta in self.metas + ([self.target[0]] if self.target else []):
+            vocab |= _posting_words(meta)
+        return vocab
+
+    def _doc(self, i: int) -> str:
+        return self.docs[i] if i < len(self.docs) else ""
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9][a-z0-9\-.]*[a-z0-9]|[a-z0-9]", text.lower())
+
+
+def _proper_nouns(query: str) -> set:
+    # Capitalized words after the first ("... at IIT Delhi"), lowercased
+    tokens = re.findall(r"[A-Za-z0-9][A-Za-z0-9\-.]*[A-Za-z0-9]|[A-Za-z0-9]", query)
+    return {t.lower() for t in tokens[1:] if t[0].isupper()}
+
+
+def _posting_words(meta: Dict) -> set:
+    text = " ".join(str(meta.get(k) or "") for k in ("postTitle", "organizationName", "location"))
+    # "Research Associate-II (RA-II)" matches "associate", "ra-ii" and "ii"
+    words = set(_words(text))
+    for w in list(words):
+        words.update(p for p in w.split("-") if p)
+    return words
+
+
+def field_value(field_name: str, meta: Dict, doc: str):
+    # Metadata first, then the "Label: value" line of the cached passage
+    value = meta.get(field_name)
+    if value is not None:
+        return value
+    label = DOC_LABELS.get(field_name)
+    if label:
+        for line in doc.splitlines():
+            if line.startswith(label + ":"):
+                return line[len(label) + 1:].strip() or None
+    return None
+
+
+class SessionStore:
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: float = 1800, max_turns: int = 6) -> None:
+        self.max_sessions = max_sessions
+        self.ttl = ttl_seconds
+        self.max_turns = max_turns
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self) -> Session:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            session = Session(uuid.uuid4().hex, self.max_turns)
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        # None for an unknown or expired id. Sessions live in this process, so
+        # an id minted by another worker is unknown here too.
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            session.updated_at = now
+            self._sessions.move_to_end(session.id)
+            return session
+
+    def _evict_expired(self, now: float) -> None:
+        # Oldest first, so stop at the first live session
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.updated_at < self.ttl:
+                break
+            self._sessions.popitem(last=False)
@@ -0,0 +1,54 @@
+import os
+from typing import Callable, List, Optional
+
+from app.chat.stores import NumpyStore
+from app.ingest.snapshot import load_snapshot
+
+
+# Multi-worker serving. The gunicorn master (see gunicorn.conf.py) preloads
+# the snapshot index here before forking, so every worker inherits the same
+# pages: the memory-mapped matrix is shared through the page cache and the
+# metadata lists copy-on-write. Workers pick it up in RAGService.__init__.
+_preloaded: Optional[NumpyStore] = None
+
+# Metadata columns the query filters touch; built once in the master
+FILTER_COLUMNS = ["category", "experienceRequired", "qualification"]
+NUMERIC_COLUMNS = ["numVacancies"]
+
+
+def vector_backend() -> str:
+    # A snapshot is served from the mapped matrix unless Chroma is asked for
+    # explicitly; loading it into Chroma rebuilds an HNSW index at startup
+    default = "numpy" if os.getenv("SNAPSHOT_DIR") else "chroma"
+    return os.getenv("VECTOR_BACKEND", default).lower()
+
+
+def query_embedder() -> Optional[Callable[[List[str]], List]]:
+    url = os.getenv("EMBEDDER_URL")
+    if not url:
+        return None
+    from app.ingest.embeddings import RemoteEmbedder
+    return RemoteEmbedder(url)
+
+
+def preload(snapshot_dir: Optional[str] = None) -> Optional[NumpyStore]:
+    global _preloaded
+    snapshot_dir = snapshot_dir or os.getenv("SNAPSHOT_DIR")
+    if not snapshot_dir or vector_backend() != "numpy":
+        print("[shared] Preload skipped: needs SNAPSHOT_DIR and the numpy backend")
+        return None
+
+    # SNAPSHOT_MMAP=0 reads the matrix into the master's heap instead (shared copy-on-write)
+    mmap = os.getenv("SNAPSHOT_MMAP", "1") != "0"
+    store = NumpyStore.from_snapshot(load_snapshot(snapshot_dir, mmap=mmap), embed_fn=query_embedder())
+    for key in FILTER_COLUMNS:
+        store.base.column(key)
+    for key in NUMERIC_COLUMNS:
+        store.base.numeric(key)
+    _preloaded = store
+    print(f"[shared] Preloaded {store.count()} documents from '{snapshot_dir}' (mmap={mmap})")
+    return store
+
+
+def preloaded_store() -> Optional[NumpyStore]:
+    return _preloaded
@@ -0,0 +1,274 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Retrieval backends behind RAGService. Both answer query() in Chroma's result
+# shape ({"ids": [[...]], "documents": [[...]], "metadatas": [[...]],
+# "distances": [[...]]}, one inner list per query) so callers do not care
+# which one is serving.
+
+class VectorStore(ABC):
+    name = "base"
+
+    @abstractmethod
+    def query(
+        self,
+        query_texts: Optional[List[str]] = None,
+        n_results: int = 8,
+        where: Optional[Dict] = None,
+        query_embeddings=None,
+    ) -> Dict:
+        ...
+
+    @abstractmethod
+    def upsert(self, ids: List[str], documents: List[str], metadatas: List[Dict]) -> None:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+
+class ChromaStore(VectorStore):
+    name = "chroma"
+
+    def __init__(self, collection, embed_fn: Optional[Callable[[List[str]], List]] = None) -> None:
+        # embed_fn overrides the collection's own embedder for query texts
+        self.collection = collection
+        self.embed_fn = embed_fn
+
+    def query(self, query_texts=None, n_results=8, where=None, query_embeddings=None) -> Dict:
+        kwargs = {"n_results": n_results}
+        if query_embeddings is None and self.embed_fn is not None:
+            query_embeddings = np.asarray(self.embed_fn(list(query_texts)), dtype=np.float32)
+        if query_embeddings is not None:
+            kwargs["query_embeddings"] = query_embeddings
+        else:
+            kwargs["query_texts"] = query_texts
+        if where:
+            kwargs["where"] = where
+        return self.collection.query(**kwargs)
+
+    def upsert(self, ids, documents, metadatas) -> None:
+        self.collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+
+    def count(self) -> int:
+        return self.collection.count()
+
+
+def default_embedder() -> Callable[[List[str]], List]:
+    # Same embedder Chroma used at ingest, so query and document vectors match
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+    return DefaultEmbeddingFunction()
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    if x.ndim == 1:
+        x = x[None, :]
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.where(norms == 0, 1, norms)
+
+
+class _Segment:
+    # Immutable row-aligned embedding matrix plus metadata columns for
+    # vectorized masks. Which rows are still live is tracked outside, in
+    # NumpyStore's published view, so a segment is never modified in place.
+    def __init__(self, matrix: np.ndarray, ids: List[str], metadatas: List[Dict], documents: List[str]) -> None:
+        self.matrix = matrix
+        self.ids = list(ids)
+        self.metadatas = list(metadatas)
+        self.documents = list(documents)
+        self.rows = {id_: i for i, id_ in enumerate(self.ids)}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._numeric: Dict[str, np.ndarray] = {}
+
+    def column(self, key: str) -> np.ndarray:
+        col = self._columns.get(key)
+        if col is None:
+            col = np.empty(len(self.metadatas), dtype=object)
+            col[:] = [(m or {}).get(key) for m in self.metadatas]
+            self._columns[key] = col
+        return col
+
+    def numeric(self, key: str) -> np.ndarray:
+        col = self._numeric.get(key)
+        if col is None:
+            col = np.full(len(self.metadatas), np.nan)
+            for i, v in enumerate(self.column(key)):
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    col[i] = v
+            self._numeric[key] = col
+        return col
+
+    def mask(self, where: Optional[Dict], alive: np.ndarray) -> np.ndarray:
+        if not where:
+            return alive
+        return alive & self._eval(where)
+
+    def _eval(self, where: Dict) -> np.ndarray:
+        out = np.ones(len(self.ids), dtype=bool)
+        for key, cond in where.items():
+            if key == "$and":
+                for sub in cond:
+                    out &= self._eval(sub)
+            elif key == "$or":
+                any_ = np.zeros(len(self.ids), dtype=bool)
+                for sub in cond:
+                    any_ |= self._eval(sub)
+                out &= any_
+            elif isinstance(cond, dict):
+                for op, val in cond.items():
+                    out &= self._compare(key, op, val)
+            else:
+                out &= self._compare(key, "$eq", cond)
+        return out
+
+    def _compare(self, key: str, op: str, val) -> np.ndarray:
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            col = self.numeric(key)
+            with np.errstate(invalid="ignore"):
+                if op == "$gt":
+                    return col > val
+                if op == "$gte":
+                    return col >= val
+                if op == "$lt":
+                    return col < val
+                return col <= val
+        col = self.column(key)
+        if op == "$eq":
+            return col == val
+        if op == "$ne":
+            return col != val
+        if op == "$in":
+            return np.isin(col, list(val))
+        if op == "$nin":
+            return ~np.isin(col, list(val))
+        raise ValueError(f"Unsupported where operator: {op}")
+
+
+class NumpyStore(VectorStore):
+    # Brute-force cosine top-k over an L2-normalized float32 matrix, typically
+    # memory-mapped from a snapshot. A batch of queries is one matrix multiply.
+    # Upserts append small in-RAM delta segments and tombstone the rows they
+    # replace, so the mapped base matrix is never copied. Readers see an
+    # immutable view ((segment, live rows) per segment) that upsert swaps in
+    # with a single assignment, so a query never sees a tombstone without the
+    # row that replaced it.
+    name = "numpy"
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        ids: Sequence[str],
+        metadatas: Sequence[Dict],
+        documents: Sequence[str],
+        embed_fn: Optional[Callable[[List[str]], List]] = None,
+        normalized: bool = False,
+    ) -> None:
+        matrix = embeddings if normalized else _normalize(embeddings)
+        base = _Segment(matrix, list(ids), list(metadatas), list(documents))
+        self._view: Tuple[Tuple[_Segment, np.ndarray], ...] = ((base, np.ones(len(base.ids), dtype=bool)),)
+        self._write_lock = threading.Lock()
+        self._embed_fn = embed_fn
+
+    @classmethod
+    def from_snapshot(cls, snap: Dict, embed_fn: Optional[Callable] = None) -> "NumpyStore":
+        return cls(
+            snap["embeddings"],
+            snap["ids"],
+            snap["metadatas"],
+            snap["documents"],
+            embed_fn=embed_fn,
+            normalized=bool(snap["manifest"].get("normalized")),
+        )
+
+    @property
+    def base(self) -> _Segment:
+        return self._view[0][0]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if self._embed_fn is None:
+            self._embed_fn = default_embedder()
+        return _normalize(np.asarray(self._embed_fn(texts), dtype=np.float32))
+
+    def count(self) -> int:
+        return sum(int(alive.sum()) for _, alive in self._view)
+
+    def query(self, query_texts=None, n_results=8, where=None, query_embeddings=None) -> Dict:
+        q = _normalize(query_embeddings) if query_embeddings is not None else self.embed(list(query_texts))
+        view = self._view
+        hits = [self._search(seg, alive, q, n_results, where) for seg, alive in view]
+
+        out = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for b in range(q.shape[0]):
+            merged = sorted(
+                ((score, seg, row) for seg, rows, scores in hits for row, score in zip(rows[b], scores[b])),
+                key=lambda t: -t[0],
+            )[:n_results]
+            out["ids"].append([seg.ids[r] for _, seg, r in merged])
+            out["documents"].append([seg.documents[r] for _, seg, r in merged])
+            out["metadatas"].append([seg.metadatas[r] for _, seg, r in merged])
+            out["distances"].append([float(1.0 - s) for s, _, _ in merged])
+        return out
+
+    def _search(self, seg: _Segment, alive: np.ndarray, q: np.ndarray, k: int, where: Optional[Dict]):
+        mask = seg.mask(where, alive)
+        if mask.all():
+            rows = None
+            scores = q @ seg.matrix.T
+        else:
+            rows = np.flatnonzero(mask)
+            scores = q @ seg.matrix[rows].T if len(rows) else np.empty((q.shape[0], 0), dtype=np.float32)
+
+        k = min(k, scores.shape[1])
+        top_rows, top_scores = [], []
+        for b in range(scores.shape[0]):
+            if k == 0:
+                top_rows.append([])
+                top_scores.append([])
+                continue
+            part = np.argpartition(-scores[b], k - 1)[:k]
+            part = part[np.argsort(-scores[b][part])]
+            top_rows.append((rows[part] if rows is not None else part).tolist())
+            top_scores.append(scores[b][part].tolist())
+        return seg, top_rows, top_scores
+
+    def upsert(self, ids, documents, metadatas) -> None:
+        # Later duplicates within one call win
+        latest = {id_: i for i, id_ in enumerate(ids)}
+        order = list(latest.values())
+        docs = [documents[i] for i in order]
+        seg = _Segment(self.embed(docs), list(latest), [metadatas[i] for i in order], docs)
+
+        with self._write_lock:
+            view = []
+            for old, alive in self._view:
+                stale = [r for r in (old.rows.get(id_) for id_ in seg.ids) if r is not None and alive[r]]
+                if stale:
+                    alive = alive.copy()
+                    alive[stale] = False
+                view.append((old, alive))
+            view.append((seg, np.ones(len(seg.ids), dtype=bool)))
+            self._view = self._compact(view)
+
+    @staticmethod
+    def _compact(view: List[Tuple[_Segment, np.ndarray]]) -> Tuple[Tuple[_Segment, np.ndarray], ...]:
+        # Merge the newest delta segments while the older one is no bigger than
+        # the newer, like a binary counter: O(log n) segments and each row is
+        # copied O(log n) times, instead of rebuilding the whole delta per batch.
+        # The base segment (index 0) is never merged.
+        while len(view) > 2 and len(view[-2][0].ids) <= len(view[-1][0].ids):
+            (a, a_alive), (b, b_alive) = view[-2], view[-1]
+            ra, rb = np.flatnonzero(a_alive), np.flatnonzero(b_alive)
+            merged = _Segment(
+                np.concatenate([a.matrix[ra], b.matrix[rb]]).astype(np.float32),
+                [a.ids[r] for r in ra] + [b.ids[r] for r in rb],
+                [a.metadatas[r] for r in ra] + [b.metadatas[r] for r in rb],
+                [a.documents[r] for r in ra] + [b.documents[r] for r in rb],
+            )
+            view[-2:] = [(merged, np.ones(len(merged.ids), dtype=bool))]
+        return tuple(view)
@@ -6,6 +6,17 @@ class Settings(BaseModel):
     gemini_api_key: str | None = os.getenv("GEMINI_API_KEY")
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "text-embedding-004")
     chroma_dir: str = os.getenv("CHROMA_PERSIST_DIR", ".chroma")
+    reindex_grace_seconds: int = int(os.getenv("REINDEX_GRACE_SECONDS", "600"))
+    startup_retry_seconds: float = float(os.getenv("STARTUP_RETRY_SECONDS", "5"))
+    session_max: int = int(os.getenv("SESSION_MAX", "1000"))
+    session_ttl_seconds: float = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+    session_max_turns: int = int(os.getenv("SESSION_MAX_TURNS", "6"))
+    live_ingest_path: str | None = os.getenv("LIVE_INGEST_PATH")
+    live_ingest_batch_size: int = int(os.getenv("LIVE_INGEST_BATCH_SIZE", "64"))
+    live_ingest_max_wait_ms: int = int(os.getenv("LIVE_INGEST_MAX_WAIT_MS", "500"))
+    live_ingest_poll_ms: int = int(os.getenv("LIVE_INGEST_POLL_MS", "250"))
+    live_ingest_from_start: bool = os.getenv("LIVE_INGEST_FROM_START", "1") != "0"
+    web_concurrency: int = int(os.getenv("WEB_CONCURRENCY", "1"))
     user_agent: str = (
         os.getenv(
             "SCRAPER_USER_AGENT",
@@ -0,0 +1,44 @@
+from contextlib import asynccontextmanager
+from typing import List
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+
+# Shared query embedder. One process holds the model; API workers call it via
+# EMBEDDER_URL instead of each loading their own copy. Run with e.g.
+#   uvicorn app.embedder:app --uds /tmp/jobyaari-embedder.sock
+_embed_fn = None
+
+
+class EmbedRequest(BaseModel):
+    texts: List[str]
+
+
+def get_embed_fn():
+    # Loaded once, on first use (the lifespan warms it up)
+    global _embed_fn
+    if _embed_fn is None:
+        from app.chat.stores import default_embedder
+        _embed_fn = default_embedder()
+    return _embed_fn
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_embed_fn()(["warmup"])
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "loaded": _embed_fn is not None}
+
+
+@app.post("/embed")
+def embed(req: EmbedRequest):
+    vectors = get_embed_fn()(req.texts)
+    return {"embeddings": [[float(x) for x in v] for v in vectors]}
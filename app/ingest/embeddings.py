@@ -26,3 +26,18 @@ def embed_texts(texts: List[str]) -> List[List[float]]:
     return [v.tolist() for v in vectors]
 
 
+class RemoteEmbedder:
+    # Client for the shared embedder service (app.embedder). url is http://host:port
+    # or unix:///path/to.sock; callable like a Chroma embedding function.
+    def __init__(self, url: str, timeout: float = 10.0) -> None:
+        import httpx
+        if url.startswith("unix://"):
+            transport = httpx.HTTPTransport(uds=url[len("unix://"):])
+            self.client = httpx.Client(transport=transport, base_url="http://embedder", timeout=timeout)
+        else:
+            self.client = httpx.Client(base_url=url, timeout=timeout)
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        resp = self.client.post("/embed", json={"texts": list(texts)})
+        resp.raise_for_status()
+        return resp.json()["embeddings"]
@@ -0,0 +1,225 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks
+    fcntl = None
+
+from app.models.schema import JobRecord
+from .chunk import job_to_document
+
+
+class JsonlTail:
+    # Incremental reader for an append-only JSONL file. Only complete lines are
+    # consumed; a rewrite restarts from the top, which is safe because upserts
+    # are keyed by sourceUrl. A rewrite is a new inode (write + os.replace), a
+    # shorter file, or changed bytes at either fingerprint: the first
+    # HEAD_BYTES of the file and the last FP_BYTES consumed before offset.
+    # The second catches in-place rewrites that keep the first record and grow.
+    HEAD_BYTES = 256
+    FP_BYTES = 256
+
+    def __init__(self, path: str, from_start: bool = True) -> None:
+        self.path = Path(path)
+        self.reset()
+        if not from_start:
+            try:
+                st = os.stat(self.path)
+                self.offset = st.st_size
+                self.inode = st.st_ino
+                self.head = self._read_at(0, self.HEAD_BYTES)
+                self.fingerprint = self._read_at(max(0, self.offset - self.FP_BYTES), self.FP_BYTES)
+            except FileNotFoundError:
+                pass
+
+    def reset(self) -> None:
+        # Next read_new starts from the top of the file
+        self.offset = 0
+        self.inode = None
+        self.head = b""
+        self.fingerprint = b""
+
+    def _read_at(self, pos: int, size: int) -> bytes:
+        with self.path.open("rb") as f:
+            f.seek(pos)
+            return f.read(size)
+
+    def _rewritten(self, st) -> bool:
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            return True
+        if self.head and not self._read_at(0, self.HEAD_BYTES).startswith(self.head):
+            return True
+        fp = self.fingerprint
+        return bool(fp) and self._read_at(self.offset - len(fp), len(fp)) != fp
+
+    def read_new(self) -> List[Dict]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if self._rewritten(st):
+            self.reset()
+            self.inode = st.st_ino
+        if st.st_size == self.offset:
+            return []
+
+        with self.path.open("rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(st.st_size - self.offset)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return []
+        self.offset += end + 1
+        self.fingerprint = (self.fingerprint + chunk[: end + 1])[-self.FP_BYTES:]
+        if len(self.head) < self.HEAD_BYTES:
+            self.head = self._read_at(0, self.HEAD_BYTES)[: self.offset]
+
+        rows = []
+        for line in chunk[:end].decode("utf-8").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except Exception as e:
+                print(f"[live-ingest] Skipping malformed line: {e}")
+        return rows
+
+
+def acquire_lock(path: str) -> Optional[IO]:
+    # Non-blocking exclusive lock held for as long as the returned file stays
+    # open (the OS drops it if the process dies). None if another process has it.
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    f = open(path, "a+")
+    if fcntl is None:
+        return f
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    f.seek(0)
+    f.truncate()
+    f.write(str(os.getpid()))
+    f.flush()
+    return f
+
+
+class LiveIngestor:
+    # Tails a JSONL file in a background thread and micro-batches new records
+    # into the live collection. get_collection is called per batch so alias
+    # flips are followed; anything with a Chroma-style upsert(ids=, documents=,
+    # metadatas=) works. on_batch receives the ingested metadatas.
+    # The file is read from the top by default so records appended while the
+    # API was down or warming up are not lost; lock_path keeps a second
+    # process from tailing into the same index.
+    def __init__(
+        self,
+        path: str,
+        get_collection: Callable,
+        on_batch: Optional[Callable[[List[Dict]], None]] = None,
+        batch_size: int = 64,
+        max_wait_ms: int = 500,
+        poll_ms: int = 250,
+        from_start: bool = True,
+        lock_path: Optional[str] = None,
+    ) -> None:
+        self.tail = JsonlTail(path, from_start=from_start)
+        self.get_collection = get_collection
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.poll = poll_ms / 1000
+        self._stop = threading.Event()
+        self._replay = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.lock_path = lock_path
+        self._lock: Optional[IO] = None
+        self.ingested = 0
+
+    def start(self) -> bool:
+        if self.lock_path:
+            self._lock = acquire_lock(self.lock_path)
+            if self._lock is None:
+                print(f"[live-ingest] '{self.lock_path}' is held by another process; not tailing here")
+                return False
+        self._thread = threading.Thread(target=self._run, name="live-ingest", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._lock:
+            self._lock.close()
+            self._lock = None
+
+    def replay(self) -> None:
+        # Re-read the file from the top on the next poll, e.g. after the API
+        # rebound to a freshly built collection that lacks the streamed records
+        self._replay.set()
+
+    def flush(self, rows: List[Dict]) -> int:
+        docs = []
+        for row in rows:
+            try:
+                job = JobRecord(**row).model_dump()
+            except Exception as e:
+                print(f"[live-ingest] Validation failed for {row.get('sourceUrl')}: {e}")
+                continue
+            docs.append(job_to_document(job))
+        if not docs:
+            return 0
+        # Later duplicates in one batch win, matching file order
+        by_id = {d["id"]: d for d in docs}
+        docs = list(by_id.values())
+        self.get_collection().upsert(
+            ids=[d["id"] for d in docs],
+            documents=[d["text"] for d in docs],
+            metadatas=[d["metadata"] for d in docs],
+        )
+        self.ingested += len(docs)
+        if self.on_batch:
+            self.on_batch([d["metadata"] for d in docs])
+        return len(docs)
+
+    def _run(self) -> None:
+        pending: List[Dict] = []
+        first_pending_at = 0.0
+        while not self._stop.is_set():
+            if self._replay.is_set():
+                self._replay.clear()
+                self.tail.reset()
+                pending = []
+                print("[live-ingest] Collection changed; replaying from the top")
+            try:
+                new_rows = self.tail.read_new()
+            except Exception as e:
+                print(f"[live-ingest] Read failed: {e}")
+                new_rows = []
+            if new_rows and not pending:
+                first_pending_at = time.monotonic()
+            pending.extend(new_rows)
+
+            due = pending and (
+                len(pending) >= self.batch_size
+                or time.monotonic() - first_pending_at >= self.max_wait
+            )
+            if due:
+                batch, pending = pending[: self.batch_size], pending[self.batch_size:]
+                first_pending_at = time.monotonic()
+                try:
+                    n = self.flush(batch)
+                    print(f"[live-ingest] Upserted {n} documents.")
+                except Exception as e:
+                    print(f"[live-ingest] Upsert failed, will retry: {e}")
+                    pending = batch + pending
+                    self._stop.wait(self.poll)
+                continue
+            self._stop.wait(self.poll)
@@ -5,7 +5,15 @@ from typing import List
 
 from app.config import get_settings
 from .chunk import job_to_document
-from .vectorstore import get_client, upsert_documents
+from .snapshot import export_snapshot
+from .vectorstore import (
+    get_client,
+    upsert_documents,
+    versioned_name,
+    resolve_alias,
+    set_alias,
+    gc_versions,
+)
 
 
 def read_jsonl(path: Path) -> List[dict]:
@@ -19,23 +27,55 @@ def read_jsonl(path: Path) -> List[dict]:
     return rows
 
 
+def ingest(args, settings, client):
+    input_path = Path(args.input)
+    jobs = read_jsonl(input_path)
+
+    docs = [job_to_document(j) for j in jobs]
+
+    if args.in_place:
+        target = resolve_alias(settings.chroma_dir, args.collection) or args.collection
+        upsert_documents(client, target, docs)
+        print(f"[ingest] Upserted {len(docs)} documents into collection '{target}'.")
+        return
+
+    # Build the new version off to the side, then flip the alias atomically.
+    # Running API workers notice the flip and rebind without a restart.
+    target = versioned_name(args.collection)
+    upsert_documents(client, target, docs)
+    previous = set_alias(settings.chroma_dir, args.collection, target, client=client)
+    print(f"[ingest] Upserted {len(docs)} documents into collection '{target}'.")
+    print(f"[ingest] Alias '{args.collection}' -> '{target}' (was '{previous}').")
+
+    grace = args.grace_seconds if args.grace_seconds is not None else settings.reindex_grace_seconds
+    dropped = gc_versions(client, settings.chroma_dir, args.collection, grace)
+    if dropped:
+        print(f"[ingest] Garbage-collected old versions: {', '.join(dropped)}")
+
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--input", type=str, required=True)
-    parser.add_argument("--collection", type=str, default="jobyaari_jobs")
+    parser.add_argument("--input", type=str, help="jobs.jsonl to ingest; omit to only export a snapshot")
+    parser.add_argument("--collection", type=str, default="jobyaari_jobs", help="Alias the API reads from")
+    parser.add_argument("--in-place", action="store_true", help="Upsert into the live collection instead of building a new version")
+    parser.add_argument("--grace-seconds", type=int, default=None, help="How long retired versions are kept before GC")
+    parser.add_argument("--export-snapshot", type=str, help="Also write a portable snapshot of the live collection to this directory")
     args = parser.parse_args()
+    if not args.input and not args.export_snapshot:
+        parser.error("Provide --input and/or --export-snapshot")
 
     settings = get_settings()
-    input_path = Path(args.input)
-    jobs = read_jsonl(input_path)
-
-    docs = [job_to_document(j) for j in jobs]
     client = get_client(settings.chroma_dir)
-    coll = upsert_documents(client, args.collection, docs)
-    print(f"[ingest] Upserted {len(docs)} documents into collection '{args.collection}'.")
+    if args.input:
+        ingest(args, settings, client)
+    if args.export_snapshot:
+        live = resolve_alias(settings.chroma_dir, args.collection) or args.collection
+        try:
+            manifest = export_snapshot(client.get_collection(live), args.export_snapshot)
+        except ValueError as e:
+            raise SystemExit(f"[ingest] Snapshot not written: {e}")
+        print(f"[ingest] Exported {manifest['count']} documents ({manifest['dim']}-d) from '{live}' to '{args.export_snapshot}'.")
 
 
 if __name__ == "__main__":
     main()
-
-
@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+
+# A snapshot is a directory that a fresh process can serve from without
+# computing a single document embedding:
+#   manifest.json    count, dim, dtype, source collection, embedding function
+#   embeddings.npy   float32 [count, dim], L2-normalized, loadable with np.load(mmap_mode="r")
+#   ids.json, metadatas.json, documents.json   row-aligned with embeddings
+# Only embeddings.npy is memory-mapped; the JSON sidecars are parsed in full
+# at load, which is the remaining startup cost for large corpora.
+SNAPSHOT_VERSION = 1
+EMBEDDING_FUNCTION = "chroma-default"
+
+
+def export_snapshot(collection, out_dir: str) -> Dict:
+    res = collection.get(include=["embeddings", "metadatas", "documents"])
+    ids: List[str] = list(res["ids"])
+    if not ids:
+        # No rows means no embedding dimension either; readers could not query it
+        raise ValueError(f"Collection '{collection.name}' is empty; nothing to snapshot")
+    embeddings = np.asarray(res["embeddings"], dtype=np.float32)
+    if embeddings.ndim != 2:
+        embeddings = embeddings.reshape(len(ids), -1)
+    # Normalize once here so readers can score with a plain dot product.
+    # Cosine-space Chroma collections rebuilt from this rank identically.
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = embeddings / np.where(norms == 0, 1, norms)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "count": len(ids),
+        "dim": int(embeddings.shape[1]),
+        "dtype": "float32",
+        "normalized": True,
+        "collection": collection.name,
+        "embeddingFunction": EMBEDDING_FUNCTION,
+        "createdAt": time.time(),
+    }
+
+    # Write next to the target and swap in, so a reader never sees half a snapshot
+    out = Path(out_dir)
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    np.save(tmp / "embeddings.npy", np.ascontiguousarray(embeddings))
+    for name, rows in (("ids", ids), ("metadatas", res["metadatas"]), ("documents", res["documents"])):
+        with (tmp / f"{name}.json").open("w", encoding="utf-8") as f:
+            json.dump(list(rows), f, ensure_ascii=False)
+    with (tmp / "manifest.json").open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    if out.exists():
+        old = out.with_name(f"{out.name}.{os.getpid()}.old")
+        os.replace(out, old)
+        os.replace(tmp, out)
+        shutil.rmtree(old)
+    else:
+        os.replace(tmp, out)
+    return manifest
+
+
+def load_snapshot(snapshot_dir: str, mmap: bool = True) -> Dict:
+    root = Path(snapshot_dir)
+    with (root / "manifest.json").open("r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+
+    snap = {"manifest": manifest}
+    for name in ("ids", "metadatas", "documents"):
+        with (root / f"{name}.json").open("r", encoding="utf-8") as f:
+            snap[name] = json.load(f)
+    snap["embeddings"] = np.load(root / "embeddings.npy", mmap_mode="r" if mmap else None)
+    if snap["embeddings"].shape[0] != len(snap["ids"]):
+        raise ValueError("Snapshot is inconsistent: embeddings and ids differ in length")
+    return snap
+
+
+def snapshot_to_collection(snap: Dict, client, collection_name: str):
+    # Precomputed embeddings go straight in; Chroma never calls its embedder here
+    coll = client.get_or_create_collection(collection_name, metadata={"hnsw:space": "cosine"})
+    batch = client.get_max_batch_size() if hasattr(client, "get_max_batch_size") else 5000
+    for i in range(0, len(snap["ids"]), batch):
+        coll.upsert(
+            ids=snap["ids"][i:i + batch],
+            embeddings=np.asarray(snap["embeddings"][i:i + batch]),
+            metadatas=snap["metadatas"][i:i + batch],
+            documents=snap["documents"][i:i + batch],
+        )
+    return coll
@@ -1,8 +1,16 @@
-from typing import List, Dict
-import chromadb
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import List, Dict, Optional
+
+
+ALIAS_FILE = "aliases.json"
 
 
 def get_client(persist_dir: str | None = None):
+    import chromadb
     if persist_dir:
         return chromadb.PersistentClient(path=persist_dir)
     return chromadb.Client()
@@ -19,3 +27,108 @@ def upsert_documents(client, collection_name: str, docs: List[Dict]):
     return coll
 
 
+# Versioned collections. Chroma only allows [a-zA-Z0-9._-] in collection names,
+# so versions are named "<alias>-v<epoch_ms>" and the alias -> version mapping
+# lives in a small JSON record next to the Chroma files.
+
+def versioned_name(alias: str, ts_ms: int | None = None) -> str:
+    if ts_ms is None:
+        ts_ms = int(time.time() * 1000)
+    return f"{alias}-v{ts_ms}"
+
+
+def _version_ts(alias: str, name: str) -> Optional[int]:
+    m = re.fullmatch(re.escape(alias) + r"-v(\d+)", name)
+    return int(m.group(1)) if m else None
+
+
+def alias_path(persist_dir: str) -> Path:
+    return Path(persist_dir) / ALIAS_FILE
+
+
+def alias_mtime(persist_dir: str) -> Optional[float]:
+    try:
+        return os.stat(alias_path(persist_dir)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def read_aliases(persist_dir: str) -> Dict:
+    path = alias_path(persist_dir)
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_aliases(persist_dir: str, aliases: Dict) -> None:
+    path = alias_path(persist_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(aliases, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    # os.replace is atomic, so readers see either the old or the new record
+    os.replace(tmp, path)
+
+
+def resolve_alias(persist_dir: str, alias: str) -> Optional[str]:
+    record = read_aliases(persist_dir).get(alias)
+    return record.get("collection") if record else None
+
+
+def _collection_names(client) -> List[str]:
+    return [c if isinstance(c, str) else c.name for c in client.list_collections()]
+
+
+def set_alias(persist_dir: str, alias: str, collection_name: str, client=None) -> Optional[str]:
+    # Point alias at collection_name; returns the collection it pointed to before.
+    # With a client, the first flip also retires a pre-versioning collection
+    # named like the alias itself, so gc_versions can drop it after the grace.
+    aliases = read_aliases(persist_dir)
+    record = aliases.get(alias) or {}
+    previous = record.get("collection")
+    if not record and client is not None and alias in _collection_names(client):
+        previous = alias
+    now = time.time()
+    retired = list(record.get("retired", []))
+    if previous and previous != collection_name:
+        retired.append({"collection": previous, "retiredAt": now})
+    aliases[alias] = {
+        "collection": collection_name,
+        "updatedAt": now,
+        "retired": [r for r in retired if r["collection"] != collection_name],
+    }
+    _write_aliases(persist_dir, aliases)
+    return previous
+
+
+def gc_versions(client, persist_dir: str, alias: str, grace_seconds: float) -> List[str]:
+    # Drop versions retired more than grace_seconds ago (including a retired
+    # pre-versioning collection), plus orphaned builds (never aliased) older
+    # than the grace period. The live version is kept.
+    aliases = read_aliases(persist_dir)
+    record = aliases.get(alias) or {}
+    current = record.get("collection")
+    now = time.time()
+    retired_at = {r["collection"]: r["retiredAt"] for r in record.get("retired", [])}
+
+    dropped: List[str] = []
+    for name in _collection_names(client):
+        ts_ms = _version_ts(alias, name)
+        # Unversioned names are only dropped once set_alias retired them
+        if name == current or (ts_ms is None and name not in retired_at):
+            continue
+        since = retired_at.get(name, ts_ms / 1000 if ts_ms is not None else now)
+        if now - since < grace_seconds:
+            continue
+        client.delete_collection(name)
+        dropped.append(name)
+
+    if dropped and record:
+        record["retired"] = [r for r in record.get("retired", []) if r["collection"] not in dropped]
+        aliases[alias] = record
+        _write_aliases(persist_dir, aliases)
+    return dropped
@@ -1,9 +1,104 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response
+from app import metrics
 from app.chat.router import router as chat_router
+from app.chat.sessions import SessionStore
+from app.config import get_settings
+
+
+async def warm_up(app: FastAPI):
+    # Build the RAG service off the event loop so liveness answers right away.
+    # A missing collection is retried instead of killing the worker.
+    settings = get_settings()
+    state = app.state.startup
+    started = time.perf_counter()
+    while True:
+        try:
+            t0 = time.perf_counter()
+            from app.chat.rag import RAGService
+            state["timings"]["import_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            t0 = time.perf_counter()
+            rag_service = await asyncio.to_thread(RAGService)
+            state["timings"]["open_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            state["timings"].update(await asyncio.to_thread(rag_service.warmup))
+            break
+        except Exception as e:
+            state["status"] = "retrying"
+            state["error"] = f"{type(e).__name__}: {e}"
+            print(f"[startup] RAG service not ready ({state['error']}); retrying in {settings.startup_retry_seconds}s")
+            await asyncio.sleep(settings.startup_retry_seconds)
+
+    try:
+        start_live_ingest(app, rag_service, settings)
+    except Exception as e:
+        # Serve without live updates rather than leave readiness stuck at "starting"
+        state["liveIngestError"] = f"{type(e).__name__}: {e}"
+        print(f"[startup] Live ingest not started: {state['liveIngestError']}")
+
+    app.state.rag_service = rag_service
+    state["timings"]["ready_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    state["status"] = "ready"
+    state.pop("error", None)
+    print(f"[startup] Ready: {state['timings']}")
+
+
+def start_live_ingest(app: FastAPI, rag_service, settings) -> None:
+    if settings.live_ingest_path and settings.web_concurrency > 1:
+        # Each worker holds its own index, so a tailer in one worker would leave
+        # the others stale; use ingest runs (alias flips) for multi-worker setups
+        print(f"[startup] LIVE_INGEST_PATH ignored: needs a single worker (WEB_CONCURRENCY={settings.web_concurrency})")
+    elif settings.live_ingest_path:
+        # Tail LIVE_INGEST_PATH (scraper --stream output or an appended jobs.jsonl)
+        # into the live collection so new postings are answerable within seconds
+        from pathlib import Path
+        from app.ingest.live import LiveIngestor
+        ingestor = LiveIngestor(
+            settings.live_ingest_path,
+            get_collection=rag_service.live_store,
+            on_batch=rag_service.on_documents_upserted,
+            batch_size=settings.live_ingest_batch_size,
+            max_wait_ms=settings.live_ingest_max_wait_ms,
+            poll_ms=settings.live_ingest_poll_ms,
+            from_start=settings.live_ingest_from_start,
+            lock_path=str(Path(settings.chroma_dir) / "live-ingest.lock"),
+        )
+        if ingestor.start():
+            app.state.live_ingestor = ingestor
+            # A reindex flips to a collection built without the streamed records
+            rag_service.on_rebind.append(ingestor.replay)
+
+
+def report_warmup_failure(app: FastAPI, task: asyncio.Task) -> None:
+    # Anything that escapes warm_up would otherwise vanish with the task
+    if task.cancelled() or task.exception() is None:
+        return
+    e = task.exception()
+    app.state.startup["status"] = "failed"
+    app.state.startup["error"] = f"{type(e).__name__}: {e}"
+    print(f"[startup] Warmup failed: {app.state.startup['error']}")
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.rag_service = None
+    app.state.live_ingestor = None
+    app.state.startup = {"status": "starting", "timings": {}}
+    settings = get_settings()
+    app.state.sessions = SessionStore(settings.session_max, settings.session_ttl_seconds, settings.session_max_turns)
+    task = asyncio.create_task(warm_up(app))
+    task.add_done_callback(lambda t: report_warmup_failure(app, t))
+    yield
+    task.cancel()
+    if app.state.live_ingestor:
+        app.state.live_ingestor.stop()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,8 +110,33 @@ app.add_middleware(
 
 app.include_router(chat_router)
 
+
+async def record_timings(request: Request, call_next):
+    # Per-request stage timings end up in the Server-Timing header and the
+    # latency histogram
+    timings = metrics.start_request()
+    t0 = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - t0
+    route = request.scope.get("route")
+    path = getattr(route, "path", "unmatched")
+    metrics.observe("jobyaari_http_request_seconds", total, path=path, status=response.status_code)
+    response.headers["Server-Timing"] = metrics.server_timing(timings, total)
+    return response
+
+
+# Not registered at all when METRICS_ENABLED=0, so the disabled path costs nothing
+if metrics.ENABLED:
+    app.middleware("http")(record_timings)
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    if not metrics.ENABLED:
+        return Response(status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     return {"message": "JobYaari Chatbot API"}
-
-
@@ -0,0 +1,220 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+
+
+# Minimal in-process metrics with Prometheus text exposition, so the hot path
+# needs no extra dependency. METRICS_ENABLED=0 turns every call into a no-op.
+ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+# With several worker processes (gunicorn sets this, see gunicorn.conf.py) each
+# process dumps its values to <dir>/metrics-<pid>.json every FLUSH_SECONDS and
+# /metrics sums all files, so whichever worker answers a scrape reports the
+# whole server. Files of exited workers stay, keeping counters monotonic.
+MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")
+FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "1"))
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CHARS_BUCKETS = (256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+
+_lock = threading.Lock()
+# name -> (type, help, buckets)
+_meta: Dict[str, Tuple[str, str, Tuple]] = {}
+# (name, sorted label items) -> value for counters, [bucket counts..., sum, count] for histograms
+_values: Dict[Tuple[str, Tuple], object] = {}
+
+# Process that owns _values; a forked child starts from zero and its own flusher
+_owner_pid: Optional[int] = None
+
+# Per-request stage durations for the Server-Timing header; set by the HTTP middleware
+_request_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def counter(name: str, help_text: str) -> None:
+    _meta[name] = ("counter", help_text, ())
+
+
+def histogram(name: str, help_text: str, buckets: Tuple = SECONDS_BUCKETS) -> None:
+    _meta[name] = ("histogram", help_text, tuple(buckets))
+
+
+def _claim() -> None:
+    # Called under _lock before every write
+    global _owner_pid
+    pid = os.getpid()
+    if pid == _owner_pid:
+        return
+    # Values inherited across fork belong to the parent's file
+    _values.clear()
+    _owner_pid = pid
+    if MULTIPROC_DIR:
+        threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+
+
+def _flush_loop() -> None:
+    pid = os.getpid()
+    while _owner_pid == pid:
+        time.sleep(FLUSH_SECONDS)
+        try:
+            _flush()
+        except OSError as e:
+            print(f"[metrics] Flush failed: {e}")
+
+
+def _flush() -> None:
+    with _lock:
+        if _owner_pid != os.getpid():
+            return
+        rows = [[name, [list(kv) for kv in labels], value] for (name, labels), value in _values.items()]
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+    path = os.path.join(MULTIPROC_DIR, f"metrics-{os.getpid()}.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(rows, f)
+    os.replace(tmp, path)
+
+
+def _collect() -> Dict[Tuple[str, Tuple], object]:
+    # This process's values, or the sum over every worker's file
+    if not MULTIPROC_DIR:
+        with _lock:
+            return {k: (list(v) if isinstance(v, list) else v) for k, v in _values.items()}
+    # Nothing recorded yet in any process still has to render, not 500
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+    _flush()
+    merged: Dict[Tuple[str, Tuple], object] = {}
+    for fname in os.listdir(MULTIPROC_DIR):
+        if not fname.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(MULTIPROC_DIR, fname), "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in rows:
+            key = (name, tuple(tuple(kv) for kv in labels))
+            prev = merged.get(key)
+            if prev is None:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(prev, value)]
+            else:
+                merged[key] = prev + value
+    return merged
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _claim()
+        _values[key] = _values.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    if not ENABLED:
+        return
+    buckets = _meta[name][2]
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _claim()
+        row = _values.get(key)
+        if row is None:
+            row = _values[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+        row[bisect_left(buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+
+class _Stage:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        observe("jobyaari_stage_seconds", elapsed, stage=self.name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((self.name, elapsed))
+        return False
+
+
+_NOOP = nullcontext()
+
+
+def stage(name: str):
+    # with stage("vector_query"): ...  -> histogram + Server-Timing entry
+    return _Stage(name) if ENABLED else _NOOP
+
+
+def start_request() -> Optional[List[Tuple[str, float]]]:
+    if not ENABLED:
+        return None
+    timings: List[Tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing(timings: List[Tuple[str, float]], total: float) -> str:
+    parts = [f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in timings]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def _fmt_labels(items: Tuple, extra: Tuple = ()) -> str:
+    items = items + extra
+    if not items:
+        return ""
+
+    def esc(v) -> str:
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    body = ",".join(f'{k}="{esc(v)}"' for k, v in items)
+    return "{" + body + "}"
+
+
+def render() -> str:
+    lines: List[str] = []
+    snapshot = _collect()
+    for name, (kind, help_text, buckets) in sorted(_meta.items()):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (metric, labels), value in sorted(snapshot.items(), key=lambda kv: kv[0]):
+            if metric != name:
+                continue
+            if kind == "counter":
+                lines.append(f"{name}{_fmt_labels(labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, n in zip(buckets, value):
+                cumulative += n
+                lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', bound),))} {cumulative}")
+            cumulative += value[len(buckets)]
+            lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', '+Inf'),))} {cumulative}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {value[-2]}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+histogram("jobyaari_http_request_seconds", "HTTP request latency by route and status.")
+histogram("jobyaari_stage_seconds", "Latency of hot-path stages (filters, vector_query, title_query, llm, ...).")
+histogram("jobyaari_prompt_chars", "Characters in the prompt sent to the LLM.", CHARS_BUCKETS)
+histogram("jobyaari_context_documents", "Retrieved documents placed in the LLM context.", COUNT_BUCKETS)
+counter("jobyaari_retrieval_cache_total", "Retrieval cache lookups by result (hit|miss).")
+counter("jobyaari_answers_total", "Answers by path (field|llm|fallback).")
+counter("jobyaari_llm_errors_total", "LLM calls that raised, by exception type.")
+counter("jobyaari_followups_total", "Session follow-ups answered without retrieval, by path (field|cached_context).")
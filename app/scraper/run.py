@@ -1,8 +1,9 @@
 import argparse
 import asyncio
 import json
+import os
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from playwright.async_api import async_playwright
 
@@ -27,7 +28,13 @@ async def fetch_detail(page, detail_url: str) -> str:
     return await page.content()
 
 
-async def scrape_category(category: str) -> List[JobRecord]:
+def append_stream(stream_path: Path, record: JobRecord):
+    # One write per record in append mode, so a tailing reader only ever sees whole lines
+    with stream_path.open("a", encoding="utf-8") as f:
+        f.write(record.model_dump_json() + "\n")
+
+
+async def scrape_category(category: str, stream_path: Optional[Path] = None) -> List[JobRecord]:
     settings = get_settings()
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
@@ -46,6 +53,8 @@ async def scrape_category(category: str) -> List[JobRecord]:
             try:
                 record = JobRecord(**record_dict)
                 records.append(record)
+                if stream_path:
+                    append_stream(stream_path, record)
             except Exception as e:
                 print(f"[scrape] Parse validation failed for {detail_url}: {e}")
 
@@ -56,11 +65,15 @@ async def scrape_category(category: str) -> List[JobRecord]:
 
 def write_outputs(records: List[JobRecord]):
     # JSONL
+    # Written aside and swapped in, so a tailer (LIVE_INGEST_PATH) sees a new
+    # file instead of a rewrite in place
     jsonl_path = PROC_DIR / "jobs.jsonl"
-    with jsonl_path.open("w", encoding="utf-8") as f:
+    tmp_path = jsonl_path.with_name(f"{jsonl_path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
         for r in records:
             f.write(r.model_dump_json())
             f.write("\n")
+    os.replace(tmp_path, jsonl_path)
 
     # CSV (minimal)
     import csv
@@ -100,9 +113,10 @@ async def main_async(args):
     else:
         raise SystemExit("Provide --all or --category <name>")
 
+    stream_path = Path(args.stream) if args.stream else None
     all_records: List[JobRecord] = []
     for cat in targets:
-        cat_records = await scrape_category(cat)
+        cat_records = await scrape_category(cat, stream_path)
         print(f"[scrape] Parsed {len(cat_records)} records for category='{cat}'")
         all_records.extend(cat_records)
 
@@ -121,6 +135,7 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--category", type=str, help="engineering|science|commerce|education")
     parser.add_argument("--all", action="store_true")
+    parser.add_argument("--stream", type=str, help="Append each record to this JSONL as soon as it is parsed (for LIVE_INGEST_PATH)")
     args = parser.parse_args()
     asyncio.run(main_async(args))
 
@@ -21,11 +21,17 @@ if go and query:
     try:
         resp = requests.post(
             f"{API_URL}/api/chat",
-            json={"query": query},
+            json={"query": query, "sessionId": st.session_state.get("session_id") or "new"},
             timeout=60,
         )
+        if resp.status_code == 404 and st.session_state.get("session_id"):
+            # Session expired on the server: start over, and say so
+            st.info("Your previous conversation expired; starting a new one.")
+            resp = requests.post(f"{API_URL}/api/chat", json={"query": query, "sessionId": "new"}, timeout=60)
         resp.raise_for_status()
         data = resp.json()
+        # Keep the server-side session so follow-ups like "salary for that one?" work
+        st.session_state["session_id"] = data.get("sessionId")
     except Exception as e:
         st.error(f"Request failed: {e}")
         st.stop()
@@ -0,0 +1,42 @@
+import gc
+import os
+import shutil
+import tempfile
+
+# Multi-worker API with one shared read-only index:
+#   SNAPSHOT_DIR=snapshots/jobyaari VECTOR_BACKEND=numpy \
+#   EMBEDDER_URL=unix:///tmp/jobyaari-embedder.sock gunicorn app.main:app
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+# Workers read this to know they are not alone (live ingest needs one worker)
+os.environ["WEB_CONCURRENCY"] = str(workers)
+# Workers share their metrics through this directory (see app/metrics.py)
+_own_metrics_dir = not os.getenv("METRICS_MULTIPROC_DIR")
+if _own_metrics_dir:
+    os.environ["METRICS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="jobyaari-metrics-")
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+
+def on_starting(server):
+    # Runs once in the master before any worker is forked. Counters from a
+    # previous run in the same directory would otherwise be summed in.
+    metrics_dir = os.environ["METRICS_MULTIPROC_DIR"]
+    for name in os.listdir(metrics_dir) if os.path.isdir(metrics_dir) else []:
+        if name.startswith("metrics-"):
+            os.remove(os.path.join(metrics_dir, name))
+
+    from app.chat.shared import preload
+    preload()
+
+
+def when_ready(server):
+    # Move everything allocated so far out of the collector's reach so GC
+    # passes in workers do not touch (and copy) the inherited pages
+    gc.freeze()
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(os.environ["METRICS_MULTIPROC_DIR"], ignore_errors=True)
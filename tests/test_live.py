@@ -0,0 +1,98 @@
+import json
+import os
+import time
+
+from app.ingest.live import JsonlTail, LiveIngestor
+
+
+def write_rows(path, rows, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def rows(n, changed=None):
+    return [{"sourceUrl": f"u{i}", "title": changed if i == 3 and changed else f"t{i}"} for i in range(n)]
+
+
+def test_reads_appended_lines_only_once(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    write_rows(path, rows(5))
+    tail = JsonlTail(str(path))
+    assert len(tail.read_new()) == 5
+    assert tail.read_new() == []
+    write_rows(path, [{"sourceUrl": "u5"}], mode="a")
+    assert tail.read_new() == [{"sourceUrl": "u5"}]
+
+
+def test_partial_line_waits_for_newline(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text('{"sourceUrl": "u0"}\n{"sourceUrl": ', encoding="utf-8")
+    tail = JsonlTail(str(path))
+    assert tail.read_new() == [{"sourceUrl": "u0"}]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('"u1"}\n')
+    assert tail.read_new() == [{"sourceUrl": "u1"}]
+
+
+def test_in_place_rewrite_that_grows_restarts_from_top(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    write_rows(path, rows(5))
+    tail = JsonlTail(str(path))
+    tail.read_new()
+
+    # Same inode, same first record, larger file; row 3 changed
+    write_rows(path, rows(7, changed="t3-updated"))
+    got = tail.read_new()
+    assert [r["sourceUrl"] for r in got] == [f"u{i}" for i in range(7)]
+    assert got[3]["title"] == "t3-updated"
+
+
+def test_replaced_file_restarts_from_top(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    write_rows(path, rows(5))
+    tail = JsonlTail(str(path))
+    tail.read_new()
+
+    tmp = tmp_path / "jobs.jsonl.tmp"
+    write_rows(tmp, rows(5))
+    os.replace(tmp, path)
+    assert len(tail.read_new()) == 5
+
+
+def test_follow_only_skips_existing_lines(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    write_rows(path, rows(5))
+    tail = JsonlTail(str(path), from_start=False)
+    assert tail.read_new() == []
+    write_rows(path, [{"sourceUrl": "u5"}], mode="a")
+    assert tail.read_new() == [{"sourceUrl": "u5"}]
+
+
+def test_replay_reingests_after_rebind(tmp_path):
+    from app.bench.corpus import generate_jobs
+
+    path = tmp_path / "jobs.jsonl"
+    write_rows(path, list(generate_jobs(3)))
+    upserted = []
+
+    class Collection:
+        def upsert(self, ids, documents, metadatas):
+            upserted.extend(ids)
+
+    ingestor = LiveIngestor(str(path), get_collection=Collection, max_wait_ms=0, poll_ms=10)
+    ingestor.start()
+    try:
+        wait_for(lambda: len(upserted) == 3)
+        ingestor.replay()
+        wait_for(lambda: len(upserted) == 6)
+    finally:
+        ingestor.stop()
+    assert upserted[:3] == upserted[3:]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
@@ -0,0 +1,30 @@
+import json
+
+from app import metrics
+
+
+def test_render_with_missing_multiproc_dir(tmp_path, monkeypatch):
+    target = tmp_path / "not" / "yet"
+    monkeypatch.setattr(metrics, "MULTIPROC_DIR", str(target))
+    text = metrics.render()
+    assert "# TYPE jobyaari_answers_total counter" in text
+    assert target.is_dir()
+
+
+def test_render_sums_worker_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_values", {})
+    buckets = len(metrics._meta["jobyaari_context_documents"][2])
+    hist = [0] * (buckets + 1) + [0.0, 0]
+    hist[1], hist[-2], hist[-1] = 2, 2.0, 2
+    for pid in (101, 102):
+        rows = [
+            ["jobyaari_answers_total", [["path", "llm"]], 3],
+            ["jobyaari_context_documents", [], hist],
+        ]
+        (tmp_path / f"metrics-{pid}.json").write_text(json.dumps(rows))
+
+    text = metrics.render()
+    assert 'jobyaari_answers_total{path="llm"} 6' in text
+    assert "jobyaari_context_documents_count 4" in text
+    assert 'jobyaari_context_documents_bucket{le="1"} 4' in text
@@ -0,0 +1,46 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.chat.router import router
+from app.chat.sessions import SessionStore
+
+
+class FakeRAG:
+    def chat(self, query, filters=None, session=None):
+        if session is not None:
+            session.add_turn(query, "answer")
+        return {"answer": "answer", "results": [], "sources": [], "answerPath": "llm"}
+
+
+def make_client(max_sessions=3):
+    app = FastAPI()
+    app.include_router(router)
+    app.state.rag_service = FakeRAG()
+    app.state.sessions = SessionStore(max_sessions=max_sessions, ttl_seconds=60)
+    return TestClient(app), app.state.sessions
+
+
+def test_stateless_requests_do_not_create_sessions():
+    client, sessions = make_client()
+    for _ in range(10):
+        body = client.post("/api/chat", json={"query": "latest engineering jobs"}).json()
+        assert "sessionId" not in body
+    assert len(sessions) == 0
+
+
+def test_conversation_survives_stateless_traffic():
+    client, sessions = make_client(max_sessions=3)
+    sid = client.post("/api/chat", json={"query": "engineering jobs", "sessionId": "new"}).json()["sessionId"]
+    for _ in range(50):
+        client.post("/api/chat", json={"query": "one-off question"})
+    resp = client.post("/api/chat", json={"query": "salary for the second one?", "sessionId": sid})
+    assert resp.status_code == 200
+    assert resp.json()["sessionId"] == sid
+    assert len(sessions.get(sid).history) == 2
+
+
+def test_unknown_session_is_rejected():
+    client, sessions = make_client()
+    resp = client.post("/api/chat", json={"query": "salary?", "sessionId": "deadbeef"})
+    assert resp.status_code == 404
+    assert len(sessions) == 0
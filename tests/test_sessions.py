@@ -0,0 +1,153 @@
+import pytest
+
+from app.chat.sessions import Session, SessionStore, field_value
+
+
+ENGINEERING = [
+    {
+        "postTitle": "Engineering Services Examination",
+        "organizationName": "UPSC",
+        "location": "all india",
+        "numVacancies": 474,
+        "sourceUrl": "https://www.jobyaari.com/jobdetails/1",
+    },
+    {
+        "postTitle": "Junior Research Fellow",
+        "organizationName": "IIT Ropar",
+        "location": "ropar",
+        "numVacancies": 1,
+        "sourceUrl": "https://www.jobyaari.com/jobdetails/2",
+    },
+    {
+        "postTitle": "Research Associate-II (RA-II)",
+        "organizationName": "CSIR-NCL",
+        "location": "pune",
+        "numVacancies": 2,
+        "sourceUrl": "https://www.jobyaari.com/jobdetails/3",
+    },
+]
+
+
+def make_session(metas=ENGINEERING):
+    session = Session("s1", max_turns=6)
+    session.remember({
+        "metadatas": [metas],
+        "documents": [[f"Post: {m['postTitle']}\nSalary: Rs. {i + 1}0,000" for i, m in enumerate(metas)]],
+    })
+    return session
+
+
+def resolved_title(session, query):
+    ref = session.resolve(query)
+    return ref[0]["postTitle"] if ref else None
+
+
+@pytest.mark.parametrize("query, title", [
+    ("What is the salary for the second one?", "Junior Research Fellow"),
+    ("Last date for the 3rd one", "Research Associate-II (RA-II)"),
+    ("Qualification for #1", "Engineering Services Examination"),
+    ("What is the salary for the IIT Ropar JRF, the research fellow?", None),
+    ("What is the salary for Junior Research Fellow at IIT Ropar?", "Junior Research Fellow"),
+    ("Qualification for RA-II post?", "Research Associate-II (RA-II)"),
+    ("Salary for the UPSC one?", "Engineering Services Examination"),
+])
+def test_resolves_ordinals_and_titles(query, title):
+    assert resolved_title(make_session(), query) == title
+
+
+@pytest.mark.parametrize("query", [
+    # A title word shared with a cached posting, plus words of its own
+    "What is the salary for Junior Research Fellow at IIT Delhi?",
+    # Bare "one" and a new constraint
+    "Is there one with more than 100 vacancies in Delhi?",
+    # Bare "it" in a question about something else
+    "Is it possible to apply for railway jobs?",
+    "Show me science jobs",
+    "What are the latest notifications in Engineering?",
+    # Matches two cached postings
+    "What is the salary for the research post?",
+])
+def test_new_questions_fall_through_to_retrieval(query):
+    assert make_session().resolve(query) is None
+
+
+def test_reference_uses_the_posting_last_discussed():
+    session = make_session()
+    session.target = (ENGINEERING[2], "Post: Research Associate-II (RA-II)")
+    assert resolved_title(session, "What is the last date for it?") == "Research Associate-II (RA-II)"
+    assert resolved_title(session, "and the salary for that one?") == "Research Associate-II (RA-II)"
+
+
+@pytest.mark.parametrize("query", [
+    "Tell me more about it",
+    "How do I apply for it?",
+    "Give me the details of that one",
+    "Is that one still open?",
+    "What is the salary for that research post?",
+])
+def test_reference_keeps_target_despite_ordinary_words(query):
+    session = make_session()
+    session.target = (ENGINEERING[2], "Post: Research Associate-II (RA-II)")
+    assert resolved_title(session, query) == "Research Associate-II (RA-II)"
+
+
+@pytest.mark.parametrize("query, title", [
+    # Entity words from another cached posting redirect the reference
+    ("What about that one from UPSC?", "Engineering Services Examination"),
+    ("And the last date for that Ropar one?", "Junior Research Fellow"),
+    # A capitalized name no cached posting has means a new search
+    ("What is the salary for that one at IIT Delhi?", None),
+    ("How do I apply for it in Mumbai?", None),
+])
+def test_entity_words_redirect_or_cancel_a_reference(query, title):
+    session = make_session()
+    session.target = (ENGINEERING[2], "Post: Research Associate-II (RA-II)")
+    assert resolved_title(session, query) == title
+
+
+def test_reference_without_target_is_ambiguous():
+    assert make_session().resolve("What is the salary for that one?") is None
+    assert resolved_title(make_session(ENGINEERING[:1]), "What is the salary for that one?") == (
+        "Engineering Services Examination"
+    )
+
+
+def test_nothing_cached():
+    assert Session("s1", max_turns=6).resolve("What is the salary for the second one?") is None
+
+
+def test_field_value_reads_passage_when_metadata_lacks_it():
+    session = make_session()
+    meta, doc = session.resolve("Salary for the second one")
+    assert field_value("salary", meta, doc) == "Rs. 20,000"
+    assert field_value("numVacancies", meta, doc) == 1
+    assert field_value("lastDate", meta, doc) is None
+
+
+def test_history_is_bounded_and_clipped():
+    session = Session("s1", max_turns=2)
+    for i in range(3):
+        session.add_turn(f"q{i}", "x" * 300)
+    assert [q for q, _ in session.history] == ["q1", "q2"]
+    assert all(len(a) == 241 for _, a in session.history)
+
+
+def test_store_does_not_recreate_unknown_or_expired_ids():
+    store = SessionStore(max_sessions=10, ttl_seconds=60)
+    session = store.create()
+    assert store.get(session.id) is session
+    assert store.get("not-a-session") is None
+    assert len(store) == 1
+
+    session.updated_at -= 61
+    assert store.get(session.id) is None
+    assert len(store) == 0
+
+
+def test_store_evicts_least_recently_used():
+    store = SessionStore(max_sessions=2, ttl_seconds=60)
+    a, b = store.create(), store.create()
+    store.get(a.id)
+    c = store.create()
+    assert store.get(b.id) is None
+    assert store.get(a.id) is a and store.get(c.id) is c
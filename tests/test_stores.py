@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from app.chat.rag import RAGService
+from app.chat import stores
+from app.chat.stores import NumpyStore, VectorStore
+
+
+DIM = 16
+
+
+class Embedder:
+    # Fixed random vector per text, so a document's own text is its nearest query
+    def __init__(self) -> None:
+        self.rng = np.random.default_rng(0)
+        self.vectors = {}
+
+    def __call__(self, texts):
+        return [self.vectors.setdefault(t, self.rng.standard_normal(DIM)) for t in texts]
+
+
+def make_store(n=50):
+    embed = Embedder()
+    cats = ["engineering", "science", "commerce", "education"]
+    vacancies = [None, 1, 5, 10, 50, 100, 474]
+    metas = [{"category": cats[i % 4], "numVacancies": vacancies[i % 7], "sourceUrl": f"u{i}"} for i in range(n)]
+    metas[3].pop("numVacancies")
+    docs = [f"doc {i}" for i in range(n)]
+    store = NumpyStore(np.array(embed(docs)), [f"id{i}" for i in range(n)], metas, docs, embed_fn=embed)
+    return store, metas
+
+
+def all_ids(store, **kwargs):
+    return store.query(query_texts=["anything"], n_results=10_000, **kwargs)["ids"][0]
+
+
+def test_vector_store_is_abstract():
+    with pytest.raises(TypeError):
+        VectorStore()
+
+
+def test_replaced_id_is_returned_once_with_new_content():
+    store, _ = make_store()
+    store.upsert(["id7"], ["doc 7 updated"], [{"category": "science", "numVacancies": 3}])
+
+    ids = all_ids(store)
+    assert ids.count("id7") == 1
+    res = store.query(query_texts=["doc 7 updated"], n_results=1)
+    assert res["ids"][0] == ["id7"]
+    assert res["documents"][0] == ["doc 7 updated"]
+    assert res["metadatas"][0][0]["numVacancies"] == 3
+
+
+def test_count_after_repeated_upserts():
+    store, _ = make_store(50)
+    for b in range(40):
+        # Two replacements of base rows, one re-replacement of a delta row, one new id
+        store.upsert(
+            [f"id{b}", f"id{b + 1}", "new-shared", f"new{b}"],
+            [f"v{b}a", f"v{b}b", f"v{b}c", f"v{b}d"],
+            [{"category": "science"}] * 4,
+        )
+    assert store.count() == 50 + 1 + 40
+    ids = all_ids(store)
+    assert len(ids) == len(set(ids)) == store.count()
+    # Compaction keeps the segment count logarithmic
+    assert len(store._view) <= 8
+
+
+def test_later_duplicate_in_one_upsert_wins():
+    store, _ = make_store(5)
+    store.upsert(["id1", "id1"], ["first", "second"], [{"v": 1}, {"v": 2}])
+    res = store.query(query_texts=["second"], n_results=1)
+    assert res["ids"][0] == ["id1"] and res["metadatas"][0][0] == {"v": 2}
+    assert store.count() == 5
+
+
+@pytest.mark.parametrize("query", [
+    "engineering jobs with more than 10 vacancies",
+    "science openings at least 50",
+    "commerce jobs with vacancies under 6",
+    "education vacancies <= 1",
+    "jobs with vacancies over 99",
+    "latest engineering notifications",
+])
+def test_where_masks_match_post_filters(query):
+    store, metas = make_store()
+    rag = RAGService(store=store, llm=lambda prompt: "")
+    where, post = rag._extract_filters_from_query(query)
+    assert where is not None
+    clauses = where["$and"] if "$and" in where else [where]
+
+    expected = {m["sourceUrl"] for m in rag._apply_post_filters(metas, clauses)}
+    got = {m["sourceUrl"] for m in store.query(query_texts=[query], n_results=1000, where=where)["metadatas"][0]}
+    assert got == expected
+
+
+def test_where_operators_over_delta_rows():
+    store, _ = make_store(8)
+    store.upsert(["id0", "x1"], ["a", "b"], [{"category": "science", "numVacancies": 200}, {"category": "science"}])
+    where = {"$and": [{"category": {"$eq": "science"}}, {"numVacancies": {"$gte": 100}}]}
+    assert set(all_ids(store, where=where)) == {"id0", "id5"}
+    assert set(all_ids(store, where={"category": {"$in": ["science"]}})) == {"id0", "id1", "id5", "x1"}
+
+
+def test_batched_query_embeddings_return_one_list_per_query():
+    store, _ = make_store()
+    embed = store._embed_fn
+    q = np.array(embed(["doc 1", "doc 2", "doc 3"]))
+    res = store.query(query_embeddings=q, n_results=4)
+    assert len(res["ids"]) == len(res["distances"]) == len(res["documents"]) == 3
+    assert [ids[0] for ids in res["ids"]] == ["id1", "id2", "id3"]
+    assert all(len(ids) == 4 for ids in res["ids"])
+    assert all(d == sorted(d) for d in res["distances"])
+
+
+def test_replaced_id_stays_visible_while_upsert_builds_segments(monkeypatch):
+    # A reader querying at any point during upsert must still see the id:
+    # probe from inside every segment construction (new delta and compaction)
+    store, _ = make_store(20)
+    store.upsert(["x0"], ["x0"], [{}])
+    seen = []
+
+    class Probe(stores._Segment):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            seen.append(all_ids(store).count("id7"))
+
+    monkeypatch.setattr(stores, "_Segment", Probe)
+    store.upsert(["id7"], ["doc 7 updated"], [{}])
+    assert seen and all(n == 1 for n in seen)
+    assert all_ids(store).count("id7") == 1
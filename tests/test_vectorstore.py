@@ -0,0 +1,38 @@
+import pytest
+
+from app.ingest.vectorstore import gc_versions, get_client, read_aliases, resolve_alias, set_alias
+
+chromadb = pytest.importorskip("chromadb")
+
+
+def names(client):
+    return sorted(c if isinstance(c, str) else c.name for c in client.list_collections())
+
+
+def test_first_flip_retires_unversioned_collection(tmp_path):
+    persist = str(tmp_path)
+    client = get_client(persist)
+    client.create_collection("jobyaari_jobs")
+    client.create_collection("jobyaari_jobs-v1")
+
+    assert set_alias(persist, "jobyaari_jobs", "jobyaari_jobs-v1", client=client) == "jobyaari_jobs"
+    assert resolve_alias(persist, "jobyaari_jobs") == "jobyaari_jobs-v1"
+
+    # Kept through the grace period, then dropped
+    assert gc_versions(client, persist, "jobyaari_jobs", grace_seconds=3600) == []
+    assert "jobyaari_jobs" in names(client)
+    assert gc_versions(client, persist, "jobyaari_jobs", grace_seconds=0) == ["jobyaari_jobs"]
+    assert names(client) == ["jobyaari_jobs-v1"]
+    assert read_aliases(persist)["jobyaari_jobs"]["retired"] == []
+
+
+def test_unversioned_collection_is_left_alone_until_retired(tmp_path):
+    persist = str(tmp_path)
+    client = get_client(persist)
+    client.create_collection("jobyaari_jobs")
+    client.create_collection("jobyaari_jobs-v1")
+
+    # No client: nothing is known about the old collection, so nothing retires it
+    set_alias(persist, "jobyaari_jobs", "jobyaari_jobs-v1")
+    assert gc_versions(client, persist, "jobyaari_jobs", grace_seconds=0) == []
+    assert names(client) == ["jobyaari_jobs", "jobyaari_jobs-v1"]